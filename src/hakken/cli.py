@@ -18,6 +18,9 @@ async def run_agent():
         print(f"\nError: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        from hakken.core.client import close_shared_http_clients
+        await close_shared_http_clients()
 
 
 def main():
@@ -40,14 +43,17 @@ def main():
                 sys.exit(1)
             cmd = ["npx", "tsx", "--tsconfig", str(project_root / "terminal_ui" / "tsconfig.json"), str(app_tsx)]
             
+        env = {**os.environ, "HAKKEN_WORK_DIR": os.getcwd()}
         try:
-            import subprocess
-            subprocess.run(cmd, check=True, cwd=project_root, env={**os.environ, "HAKKEN_WORK_DIR": os.getcwd()})
-        except Exception as e:
+            os.chdir(project_root)
+            os.execvpe(cmd[0], cmd, env)
+        except OSError as e:
             print(f"Error launching React UI: {e}")
             sys.exit(1)
     else:
         import asyncio
+        from hakken.utils.env import load_env_file
+        load_env_file()
         asyncio.run(run_agent())
 
 if __name__ == "__main__":
@@ -1,6 +1,27 @@
-from hakken.core.agent import Agent
-from hakken.core.client import APIClient
-from hakken.core.factory import AgentFactory
-from hakken.core.state import AgentState, TokenUsage, Todo
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Agent", "APIClient", "AgentFactory", "AgentState", "TokenUsage", "Todo"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from hakken.core.agent import Agent
+    from hakken.core.client import APIClient
+    from hakken.core.factory import AgentFactory
+    from hakken.core.state import AgentState, TokenUsage, Todo
+
+_EXPORTS = {
+    "Agent": "hakken.core.agent",
+    "APIClient": "hakken.core.client",
+    "AgentFactory": "hakken.core.factory",
+    "AgentState": "hakken.core.state",
+    "TokenUsage": "hakken.core.state",
+    "Todo": "hakken.core.state",
+}
+
+__all__ = ["Agent", "APIClient", "AgentFactory", "AgentState", "TokenUsage", "Todo"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,24 +1,42 @@
-from hakken.core.client import APIClient
+import asyncio
+from typing import TYPE_CHECKING
+
 from hakken.core.message_builder import MessageBuilder
 from hakken.core.response_handler import ResponseHandler
 from hakken.core.tool_executor import ToolExecutor
-from hakken.prompts.manager import PromptManager
-from hakken.tools.manager import ToolManager
-from hakken.history.manager import HistoryManager
-from hakken.subagents.manager import SubagentManager
-from hakken.terminal_bridge import UIManager
+
+if TYPE_CHECKING:
+    from hakken.core.client import APIClient
+    from hakken.prompts.manager import PromptManager
+    from hakken.tools.manager import ToolManager
+    from hakken.history.manager import HistoryManager
+    from hakken.subagents.manager import SubagentManager
+    from hakken.terminal_bridge import UIManager
 
 
 class Agent:
+    __slots__ = (
+        "_tool_manager",
+        "_api_client",
+        "_ui_manager",
+        "_history_manager",
+        "_prompt_manager",
+        "_subagent_manager",
+        "_is_in_task",
+        "_is_bridge_mode",
+        "_system_prompt",
+        "_response_handler",
+        "_tool_executor",
+    )
    
     def __init__(
         self,
-        tool_manager: ToolManager,
-        api_client: APIClient,
+        tool_manager: "ToolManager",
+        api_client: "APIClient",
         ui_manager: "UIManager",
-        history_manager: HistoryManager,
-        prompt_manager: PromptManager,
-        subagent_manager: SubagentManager,
+        history_manager: "HistoryManager",
+        prompt_manager: "PromptManager",
+        subagent_manager: "SubagentManager",
         is_bridge_mode: bool = False
     ):
         self._tool_manager = tool_manager
@@ -29,6 +47,7 @@ class Agent:
         self._subagent_manager = subagent_manager
         self._is_in_task = False
         self._is_bridge_mode = is_bridge_mode
+        self._system_prompt = None
         
         self._response_handler = ResponseHandler(ui_manager)
         self._tool_executor = ToolExecutor(
@@ -44,14 +63,23 @@ class Agent:
     def add_message(self, message):
         self._history_manager.add_message(message)
 
+    @property
+    def system_prompt(self) -> str:
+        if self._system_prompt is None:
+            self._system_prompt = self._prompt_manager.get_system_prompt()
+        return self._system_prompt
+
+    def warm_caches(self) -> None:
+        self._tool_manager.get_tools_description()
+
     async def start_conversation(self):
         self.add_message(
-            MessageBuilder.create_system_message(
-                self._prompt_manager.get_system_prompt()
-            )
+            MessageBuilder.create_system_message(self.system_prompt, cache=True)
         )
         
+        warmup = asyncio.get_running_loop().run_in_executor(None, self.warm_caches)
         user_input = await self._ui_manager.get_user_input()
+        await warmup
         self.add_message(MessageBuilder.create_user_message(user_input))
 
         await self._recursive_message_handling()
@@ -60,7 +88,12 @@ class Agent:
         self._is_in_task = True
         self._history_manager.start_new_chat()
         
-        self.add_message(MessageBuilder.create_system_message(task_system_prompt))
+        self.add_message(
+            MessageBuilder.create_system_message(
+                task_system_prompt,
+                shared_prefix=self.system_prompt
+            )
+        )
         self.add_message(MessageBuilder.create_user_message(user_input))
 
         await self._recursive_message_handling()
@@ -68,18 +101,29 @@ class Agent:
         return self._history_manager.finish_chat_get_response()
 
     async def _recursive_message_handling(self):
-        self._history_manager.auto_messages_compression()
+        while True:
+            response_message = await self._run_model_turn()
+
+            if ResponseHandler.has_tool_calls(response_message):
+                await self._tool_executor.handle_tool_calls(response_message.tool_calls)
+                self._print_context_window_and_total_cost()
+                continue
+
+            self._print_context_window_and_total_cost()
+            if not await self._handle_conversation_turn(response_message):
+                return
 
+    async def _run_model_turn(self):
         request = self._build_api_request()
         
         self._ui_manager.print_simple_message("", "🤖")
         
-        stream_generator = self._api_client.get_completion_stream(request)
+        stream_generator = self._api_client.get_completion_stream_async(request)
         
         if stream_generator is None:
             raise Exception("Stream generator is None - API client returned no response")
         
-        response_message, _, token_usage = self._response_handler.process_stream(
+        response_message, _, token_usage = await self._response_handler.process_stream(
             stream_generator
         )
             
@@ -90,21 +134,11 @@ class Agent:
         self.add_message(assistant_message)
         
         self._history_manager.auto_messages_compression()
-
-        if ResponseHandler.has_tool_calls(response_message) and len(response_message.tool_calls) > 0:
-            await self._tool_executor.handle_tool_calls(response_message.tool_calls)
-            self._print_context_window_and_total_cost()
-            await self._recursive_message_handling()
-        else:
-            self._print_context_window_and_total_cost()
-            await self._handle_conversation_turn(response_message)
+        return response_message
 
     def _build_api_request(self) -> dict:
-        messages = MessageBuilder.apply_cache_control(
-            self._history_manager.get_current_messages()
-        )
         return {
-            "messages": messages,
+            "messages": self._history_manager.get_request_messages(),
             "tools": self._tool_manager.get_tools_description(),
         }
 
@@ -126,7 +160,7 @@ class Agent:
         
         return assistant_message
 
-    async def _handle_conversation_turn(self, response_message):
+    async def _handle_conversation_turn(self, response_message) -> bool:
         has_tool_calls = ResponseHandler.has_tool_calls(response_message)
         content = response_message.content or ""
         trimmed_content = ResponseHandler.get_trimmed_content(content)
@@ -136,17 +170,14 @@ class Agent:
                 self._ui_manager.print_info(
                     f"[agent-debug] turn completed without tool call | len={len(trimmed_content)}"
                 )
-            return
+            return False
         
         user_input = await self._ui_manager.get_user_input()
         self.add_message(MessageBuilder.create_user_message(user_input))
-        await self._recursive_message_handling()
+        return True
 
     def _print_context_window_and_total_cost(self):
         self._ui_manager.print_simple_message(
             f"(context window: {self._history_manager.current_context_window}%, "
             f"total cost: {self._api_client.total_cost}$)"
-        )
-
-    def print_streaming_content(self, content):
-        self._ui_manager.print_streaming_content(content)
\ No newline at end of file
+        )
\ No newline at end of file
@@ -1,24 +1,190 @@
+import asyncio
+import importlib.util
 import logging
-from typing import Any, Dict, Generator, Tuple, Optional
-from openai import OpenAI
+from typing import Any, AsyncGenerator, Dict, Generator, Tuple, Optional
+import httpx
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+)
 from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageFunctionToolCall
 from openai.types.chat.chat_completion_message_function_tool_call import Function
 import time 
 from hakken.core.config import APIClientConfig
+from hakken.core.models import AssistantMessage
 from hakken.utils.retry import is_retryable, retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 120.0
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_shared_http_client: Optional[DefaultHttpxClient] = None
+_shared_async_http_client: Optional[DefaultAsyncHttpxClient] = None
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=DEFAULT_CONNECTION_LIMITS.max_connections,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def get_shared_http_client() -> DefaultHttpxClient:
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = DefaultHttpxClient(limits=_connection_limits())
+    return _shared_http_client
+
+
+def get_shared_async_http_client() -> DefaultAsyncHttpxClient:
+    global _shared_async_http_client
+    if _shared_async_http_client is None:
+        _shared_async_http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=_connection_limits()
+        )
+    return _shared_async_http_client
+
+
+async def close_shared_http_clients() -> None:
+    global _shared_http_client, _shared_async_http_client
+    if _shared_async_http_client is not None:
+        await _shared_async_http_client.aclose()
+        _shared_async_http_client = None
+    if _shared_http_client is not None:
+        _shared_http_client.close()
+        _shared_http_client = None
+
+
+def reduce_tool_call_delta(
+    index: int,
+    tool_id: Optional[str],
+    name: Optional[str],
+    arguments: Optional[str],
+    ids: list[Optional[str]],
+    names: list[Optional[str]],
+    arg_parts: list[list[str]],
+) -> None:
+    while len(ids) <= index:
+        ids.append(None)
+        names.append(None)
+        arg_parts.append([])
+    if tool_id:
+        ids[index] = tool_id
+    if name:
+        names[index] = name
+    if arguments:
+        arg_parts[index].append(arguments)
+
+
+class StreamAccumulator:
+    __slots__ = (
+        "content_parts",
+        "_append_content",
+        "tool_ids",
+        "tool_names",
+        "tool_arg_parts",
+        "token_usage",
+        "cost",
+    )
+
+    def __init__(self):
+        self.content_parts: list[str] = []
+        self._append_content = self.content_parts.append
+        self.tool_ids: list[Optional[str]] = []
+        self.tool_names: list[Optional[str]] = []
+        self.tool_arg_parts: list[list[str]] = []
+        self.token_usage = None
+        self.cost = 0
+
+    def feed(self, chunk) -> Optional[str]:
+        usage = getattr(chunk, 'usage', None)
+        if usage:
+            self.token_usage = usage
+            cost = getattr(usage, 'model_extra', {})
+            if isinstance(cost, dict):
+                self.cost += cost.get("cost", 0)
+            return None
+        
+        choices = chunk.choices
+        if not choices:
+            return None
+        delta = choices[0].delta
+        tool_call_deltas = getattr(delta, 'tool_calls', None)
+        if tool_call_deltas:
+            for tool_call_delta in tool_call_deltas:
+                self._add_tool_call_delta(tool_call_delta)
+        
+        content_chunk = delta.content
+        if content_chunk:
+            self._append_content(content_chunk)
+        return content_chunk
+
+    def _add_tool_call_delta(self, tool_call_delta) -> None:
+        index = tool_call_delta.index
+        if index is None:
+            return
+        function = tool_call_delta.function
+        reduce_tool_call_delta(
+            index,
+            tool_call_delta.id,
+            function.name if function else None,
+            function.arguments if function else None,
+            self.tool_ids,
+            self.tool_names,
+            self.tool_arg_parts,
+        )
+
+    def build_message(self):
+        content = "".join(self.content_parts)
+        if not any(self.tool_ids):
+            return AssistantMessage(content=content, usage=self.token_usage)
+        
+        tool_calls = [
+            ChatCompletionMessageFunctionToolCall.model_construct(
+                id=tool_id,
+                function=Function.model_construct(name=name, arguments="".join(arg_parts)),
+                type='function'
+            )
+            for tool_id, name, arg_parts in zip(self.tool_ids, self.tool_names, self.tool_arg_parts)
+            if tool_id and name
+        ]
+        message = ChatCompletionMessage.model_construct(
+            content=content,
+            role="assistant",
+            tool_calls=tool_calls or None
+        )
+
+        if self.token_usage:
+            message.usage = self.token_usage
+        return message
+
 
 class APIClient:
+    __slots__ = ("config", "client", "async_client", "prompt_cache_key", "_total_cost")
+
     def __init__(self, config: Optional[APIClientConfig] = None):
         self.config = config or APIClientConfig()
         
         self.client = OpenAI(
             api_key=self.config.api_key,
             base_url=self.config.base_url,
-            timeout=self.config.timeout
+            timeout=self.config.timeout,
+            http_client=get_shared_http_client()
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=self.config.api_key,
+            base_url=self.config.base_url,
+            timeout=self.config.timeout,
+            http_client=get_shared_async_http_client()
         )
+        self.prompt_cache_key = self.config.prompt_cache_key
         self._total_cost = 0
     
     @property
@@ -27,6 +193,7 @@ class APIClient:
     
     def get_completion(self, request_params: Dict[str, Any]) -> Tuple[Any, Any]:
         request_params["model"] = self.config.model
+        self._apply_prompt_cache_key(request_params)
         
         def make_request():
             response = self.client.chat.completions.create(**request_params)
@@ -46,10 +213,7 @@ class APIClient:
         )
     
     def get_completion_stream(self, request_params: Dict[str, Any]) -> Generator[str, None, None]:
-        request_params["model"] = self.config.model
-        request_params["stream"] = True
-        request_params["stream_options"] = {"include_usage": True}
-        
+        self._prepare_stream_request(request_params)
         last_error = None
         
         for attempt in range(self.config.max_retries):
@@ -73,6 +237,47 @@ class APIClient:
         raise Exception(
             f"Streaming API request failed after {self.config.max_retries} retries: {str(last_error)}"
         )
+
+    async def get_completion_stream_async(self, request_params: Dict[str, Any]) -> AsyncGenerator[Any, None]:
+        self._prepare_stream_request(request_params)
+        last_error = None
+        
+        for attempt in range(self.config.max_retries):
+            try:
+                async for item in self._stream_completion_async(request_params):
+                    yield item
+                return
+                
+            except Exception as e:
+                last_error = e
+                
+                if not self._is_retryable_error(e) or attempt == self.config.max_retries - 1:
+                    raise Exception(f"Streaming API request failed: {str(e)}")
+                
+                delay = self._calculate_delay(attempt)
+                logger.warning(
+                    f"Streaming request failed (attempt {attempt + 1}/{self.config.max_retries}): {e}. "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                await asyncio.sleep(delay)
+        
+        raise Exception(
+            f"Streaming API request failed after {self.config.max_retries} retries: {str(last_error)}"
+        )
+
+    def _prepare_stream_request(self, request_params: Dict[str, Any]) -> None:
+        request_params["model"] = self.config.model
+        request_params["stream"] = True
+        request_params["stream_options"] = {"include_usage": True}
+        self._apply_prompt_cache_key(request_params)
+
+    def _apply_prompt_cache_key(self, request_params: Dict[str, Any]) -> None:
+        if self.prompt_cache_key:
+            # Sent as extra_body: openai SDKs before prompt_cache_key was added
+            # reject it as a keyword argument.
+            extra_body = dict(request_params.get("extra_body") or {})
+            extra_body.setdefault("prompt_cache_key", self.prompt_cache_key)
+            request_params["extra_body"] = extra_body
     
     def _is_retryable_error(self, error: Exception) -> bool:
         return is_retryable(error)
@@ -83,74 +288,26 @@ class APIClient:
     
     def _stream_completion(self, request_params: Dict[str, Any]) -> Generator[str, None, None]:
         stream = self.client.chat.completions.create(**request_params)
-        
-        full_content = ""
-        tool_calls = []
-        current_tool_call = None
-        token_usage = None
+        accumulator = StreamAccumulator()
+        feed = accumulator.feed
         
         for chunk in stream:
-            if hasattr(chunk, 'usage') and chunk.usage:
-                token_usage = chunk.usage
-                cost = getattr(token_usage, 'model_extra', {})
-                if isinstance(cost, dict):
-                    self._total_cost += cost.get("cost", 0)
-                continue
-            
-            if chunk.choices[0].delta.content:
-                content_chunk = chunk.choices[0].delta.content
-                full_content += content_chunk
+            content_chunk = feed(chunk)
+            if content_chunk:
                 yield content_chunk
-            
-            if hasattr(chunk.choices[0].delta, 'tool_calls') and chunk.choices[0].delta.tool_calls:
-                for tool_call_delta in chunk.choices[0].delta.tool_calls:
-                    if tool_call_delta.index is not None:
-                        while len(tool_calls) <= tool_call_delta.index:
-                            tool_calls.append({
-                                'id': None,
-                                'type': 'function',
-                                'function': {'name': None, 'arguments': ''}
-                            })
-                        
-                        current_tool_call = tool_calls[tool_call_delta.index]
-                        
-                        if tool_call_delta.id:
-                            current_tool_call['id'] = tool_call_delta.id
-                        
-                        if tool_call_delta.function:
-                            if tool_call_delta.function.name:
-                                current_tool_call['function']['name'] = tool_call_delta.function.name
-                            if tool_call_delta.function.arguments:
-                                current_tool_call['function']['arguments'] += tool_call_delta.function.arguments
-        
-        formatted_tool_calls = None
-        if tool_calls and any(tc['id'] for tc in tool_calls):
-            formatted_tool_calls = []
-            for tc in tool_calls:
-                if tc['id'] and tc['function']['name']:
-                    formatted_tool_calls.append(
-                        ChatCompletionMessageFunctionToolCall(
-                            id=tc['id'],
-                            function=Function(
-                                name=tc['function']['name'],
-                                arguments=tc['function']['arguments']
-                            ),
-                            type='function'
-                        )
-                    )
         
-        message = ChatCompletionMessage(
-            content=full_content,
-            role="assistant",
-            tool_calls=formatted_tool_calls,
-            refusal=None,
-            annotations=None,
-            audio=None,
-            function_call=None,
-            reasoning=None
-        )
+        self._total_cost += accumulator.cost
+        yield accumulator.build_message()
 
-        if token_usage:
-            message.usage = token_usage
+    async def _stream_completion_async(self, request_params: Dict[str, Any]) -> AsyncGenerator[Any, None]:
+        stream = await self.async_client.chat.completions.create(**request_params)
+        accumulator = StreamAccumulator()
+        feed = accumulator.feed
+        
+        async for chunk in stream:
+            content_chunk = feed(chunk)
+            if content_chunk:
+                yield content_chunk
         
-        yield message
\ No newline at end of file
+        self._total_cost += accumulator.cost
+        yield accumulator.build_message()
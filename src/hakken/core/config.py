@@ -1,4 +1,6 @@
-from pydantic import Field, field_validator
+from typing import Optional
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,6 +12,7 @@ class APIClientConfig(BaseSettings):
     max_retries: int = Field(3)
     base_delay: float = Field(1.0)
     max_delay: float = Field(30.0)
+    prompt_cache_key: Optional[str] = Field(None)
     
     model_config = SettingsConfigDict(
         env_prefix="OPENAI_",
@@ -19,23 +22,12 @@ class APIClientConfig(BaseSettings):
         extra="ignore"
     )
     
-    @field_validator('timeout')
-    @classmethod
-    def validate_timeout(cls, v: float) -> float:
-        if v <= 0:
+    @model_validator(mode="after")
+    def validate_limits(self) -> "APIClientConfig":
+        if self.timeout <= 0:
             raise ValueError("timeout must be positive")
-        return v
-    
-    @field_validator('max_retries')
-    @classmethod
-    def validate_max_retries(cls, v: int) -> int:
-        if v < 0:
+        if self.max_retries < 0:
             raise ValueError("max_retries must be non-negative")
-        return v
-    
-    @field_validator('base_delay', 'max_delay')
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        if v < 0:
+        if self.base_delay < 0 or self.max_delay < 0:
             raise ValueError("delay must be non-negative")
-        return v
+        return self
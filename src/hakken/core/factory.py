@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,6 +11,18 @@ if TYPE_CHECKING:
     from hakken.terminal_bridge import UIManager
 
 
+@lru_cache(maxsize=1)
+def _default_prompt_manager() -> "PromptManager":
+    from hakken.prompts.manager import PromptManager
+    return PromptManager()
+
+
+@lru_cache(maxsize=1)
+def _default_api_client_config() -> "APIClientConfig":
+    from hakken.core.config import APIClientConfig
+    return APIClientConfig()
+
+
 class AgentFactory:
     @staticmethod
     def create_tool_manager(
@@ -27,12 +40,11 @@ class AgentFactory:
     @staticmethod
     def create_api_client(config: Optional["APIClientConfig"] = None) -> "APIClient":
         from hakken.core.client import APIClient
-        return APIClient(config=config)
+        return APIClient(config=config or _default_api_client_config())
     
     @staticmethod
     def create_prompt_manager() -> "PromptManager":
-        from hakken.prompts.manager import PromptManager
-        return PromptManager()
+        return _default_prompt_manager()
     
     @staticmethod
     def create_subagent_manager() -> "SubagentManager":
@@ -1,55 +1,56 @@
-from typing import List, Dict, Any, Optional, Literal, Union
-from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
 
+CACHE_CONTROL = {"type": "ephemeral"}
+FALLBACK_TEXT = "I didn't receive any content from the model. Please provide more detail or try again."
 
-class CacheControl(BaseModel):
-    type: Literal["ephemeral"] = "ephemeral"
 
+def text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+    block = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = CACHE_CONTROL
+    return block
 
-class TextContent(BaseModel):
-    type: Literal["text"] = "text"
-    text: str
-    cache_control: Optional[CacheControl] = None
 
-
-class SystemMessage(BaseModel):
-    role: Literal["system"] = "system"
-    content: List[TextContent]
-
-
-class UserMessage(BaseModel):
-    role: Literal["user"] = "user"
-    content: List[TextContent]
-
-
-class AssistantMessage(BaseModel):
-    role: Literal["assistant"] = "assistant"
-    content: Optional[str] = None
-    tool_calls: Optional[Any] = None
-
-
-Message = Union[SystemMessage, UserMessage, AssistantMessage]
+def tool_call_dict(tool_call: Any) -> Dict[str, Any]:
+    if isinstance(tool_call, dict):
+        return tool_call
+    function = tool_call.function
+    return {
+        "id": tool_call.id,
+        "type": tool_call.type or "function",
+        "function": {"name": function.name, "arguments": function.arguments},
+    }
 
 
 class MessageBuilder:
     
     @staticmethod
-    def create_system_message(content: str) -> Dict[str, Any]:
-        message = SystemMessage(content=[TextContent(text=content)])
-        return message.model_dump(exclude_none=True)
+    def create_system_message(
+        content: str,
+        shared_prefix: Optional[str] = None,
+        cache: bool = False
+    ) -> Dict[str, Any]:
+        blocks = []
+        if shared_prefix:
+            blocks.append(text_block(shared_prefix, cache=True))
+        blocks.append(text_block(content, cache=cache))
+        return {"role": "system", "content": blocks}
     
     @staticmethod
     def create_user_message(content: str) -> Dict[str, Any]:
-        message = UserMessage(content=[TextContent(text=content)])
-        return message.model_dump(exclude_none=True)
+        return {"role": "user", "content": [text_block(content)]}
     
     @staticmethod
     def create_assistant_message(
         content: Optional[str] = None, 
         tool_calls: Optional[Any] = None
     ) -> Dict[str, Any]:
-        message = AssistantMessage(content=content, tool_calls=tool_calls)
-        return message.model_dump(exclude_none=True)
+        message: Dict[str, Any] = {"role": "assistant"}
+        if content is not None:
+            message["content"] = content
+        if tool_calls is not None:
+            message["tool_calls"] = [tool_call_dict(tool_call) for tool_call in tool_calls]
+        return message
 
     @staticmethod
     def apply_cache_control(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -63,19 +64,12 @@ class MessageBuilder:
         content = last_message["content"]
         
         if isinstance(content, list) and len(content) > 0 and isinstance(content[-1], dict):
-            content[-1]["cache_control"] = CacheControl().model_dump()
+            content[-1]["cache_control"] = CACHE_CONTROL
         elif isinstance(content, str):
-            text_content = TextContent(
-                text=content, 
-                cache_control=CacheControl()
-            )
-            messages[-1]["content"] = [text_content.model_dump(exclude_none=True)]
+            messages[-1]["content"] = [text_block(content, cache=True)]
         
         return messages
 
     @staticmethod
     def create_fallback_content() -> List[Dict[str, str]]:
-        content = TextContent(
-            text="I didn't receive any content from the model. Please provide more detail or try again."
-        )
-        return [content.model_dump(exclude_none=True)]
+        return [text_block(FALLBACK_TEXT)]
@@ -1,23 +1,21 @@
+from dataclasses import dataclass
 from typing import Optional, Any
-from pydantic import BaseModel
 
 
-class AssistantMessage(BaseModel):
+@dataclass(slots=True)
+class AssistantMessage:
     content: str
     role: str = "assistant"
     tool_calls: Optional[Any] = None
+    usage: Optional[Any] = None
 
-    class Config:
-        arbitrary_types_allowed = True
 
-
-class ErrorMessage(BaseModel):
+@dataclass(slots=True)
+class ErrorMessage:
     content: str
     role: str = "assistant"
     tool_calls: Optional[Any] = None
-
-    class Config:
-        arbitrary_types_allowed = True
+    usage: Optional[Any] = None
 
     @classmethod
     def from_error(cls, error_msg: str) -> "ErrorMessage":
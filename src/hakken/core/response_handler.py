@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Optional, Tuple, Any
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, Any
 
 from hakken.core.models import AssistantMessage
 
@@ -6,34 +7,68 @@ if TYPE_CHECKING:
     from hakken.terminal_bridge import UIManager
 
 
+class StreamCoalescer:
+    FLUSH_INTERVAL = 0.01
+    MAX_BUFFER = 64
+
+    def __init__(
+        self,
+        write: Callable[[str], None],
+        flush_interval: float = FLUSH_INTERVAL,
+        max_buffer: int = MAX_BUFFER
+    ):
+        self._write = write
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+
+    def push(self, chunk: str) -> None:
+        self._buffer.append(chunk)
+        self._buffered_chars += len(chunk)
+        if (
+            self._buffered_chars >= self._max_buffer
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+
+
 class ResponseHandler:
     
     def __init__(self, ui_manager: "UIManager"):
         self._ui_manager = ui_manager
 
-    def process_stream(self, stream_generator) -> Tuple[Any, str, Optional[Any]]:
+    async def process_stream(self, stream_generator) -> Tuple[Any, str, Optional[Any]]:
         response_message = None
-        full_content = ""
+        content_parts: list[str] = []
         token_usage = None
         
-        iterator = iter(stream_generator)
-        
         self._ui_manager.start_stream_display()
+        coalescer = StreamCoalescer(self._ui_manager.print_streaming_content)
+        append_content = content_parts.append
+        push = coalescer.push
         
-        for chunk in iterator:
-            if isinstance(chunk, str):
-                full_content += chunk
-                self._ui_manager.print_streaming_content(chunk)
-            elif hasattr(chunk, 'role') and chunk.role == 'assistant':
+        async for chunk in stream_generator:
+            if type(chunk) is str:
+                append_content(chunk)
+                push(chunk)
+            else:
                 response_message = chunk
-                if hasattr(chunk, 'usage') and chunk.usage:
-                    token_usage = chunk.usage
+                token_usage = getattr(chunk, 'usage', None)
                 break
-            elif hasattr(chunk, 'usage') and chunk.usage:
-                token_usage = chunk.usage
 
+        coalescer.flush()
         self._ui_manager.stop_stream_display()
         
+        full_content = "".join(content_parts)
         if response_message is None:
             response_message = AssistantMessage(content=full_content)
             
@@ -44,15 +79,15 @@ class ResponseHandler:
         if isinstance(content, str):
             return content.strip()
         if isinstance(content, list):
-            text_parts = []
-            for block in content:
-                if isinstance(block, dict) and block.get("type") == "text":
-                    text_value = block.get("text", "")
-                    if isinstance(text_value, str):
-                        text_parts.append(text_value)
-            return " ".join(text_parts).strip()
+            return " ".join([
+                text
+                for block in content
+                if type(block) is dict
+                and block.get("type") == "text"
+                and type(text := block.get("text")) is str
+            ]).strip()
         return ""
 
     @staticmethod
     def has_tool_calls(response_message) -> bool:
-        return hasattr(response_message, 'tool_calls') and response_message.tool_calls
+        return bool(getattr(response_message, 'tool_calls', None))
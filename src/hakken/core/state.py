@@ -1,55 +1,120 @@
-from typing import List, Dict, Any, Optional, Literal
-from pydantic import BaseModel, Field
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Iterable, List, Dict, Any, Optional, Literal
 
 
-class TokenUsage(BaseModel):
+def _fields_dict(obj) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+
+@dataclass(frozen=True, slots=True)
+class TokenUsage:
     input_tokens: int = 0
     output_tokens: int = 0
     total_tokens: int = 0
 
 
-class Todo(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Todo:
     id: str
     content: str
     status: Literal["pending", "in_progress", "completed"] = "pending"
 
 
-class AgentState(BaseModel):
+class MessageLog(Sequence):
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        self._items = list(items)
+        self._length = len(self._items)
+
+    def append(self, message: Dict[str, Any]) -> "MessageLog":
+        items = self._items if self._length == len(self._items) else self._items[:self._length]
+        items.append(message)
+        log = MessageLog.__new__(MessageLog)
+        log._items = items
+        log._length = self._length + 1
+        return log
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return self._items[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("message index out of range")
+        return self._items[index]
+
+    def __iter__(self):
+        return islice(self._items, self._length)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"MessageLog({self.to_list()!r})"
+
+
+@dataclass(frozen=True, slots=True)
+class AgentState:
     mode: Literal["idle", "running", "blocked", "task"] = "idle"
-    messages: List[Dict[str, Any]] = Field(default_factory=list)
-    token_usage: TokenUsage = Field(default_factory=TokenUsage)
+    messages: MessageLog = field(default_factory=MessageLog)
+    token_usage: TokenUsage = field(default_factory=TokenUsage)
     total_cost: float = 0.0
     context_window_percent: float = 0.0
-    todos: List[Todo] = Field(default_factory=list)
+    todos: List[Todo] = field(default_factory=list)
     current_task_id: Optional[str] = None
 
-    model_config = {"frozen": False}
+    def __post_init__(self):
+        if not isinstance(self.messages, MessageLog):
+            object.__setattr__(self, "messages", MessageLog(self.messages))
 
     def to_dict(self) -> Dict[str, Any]:
-        return self.model_dump()
+        return {
+            "mode": self.mode,
+            "messages": self.messages.to_list(),
+            "token_usage": _fields_dict(self.token_usage),
+            "total_cost": self.total_cost,
+            "context_window_percent": self.context_window_percent,
+            "todos": [_fields_dict(todo) for todo in self.todos],
+            "current_task_id": self.current_task_id,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AgentState":
-        return cls.model_validate(data)
+        data = dict(data)
+        if isinstance(data.get("token_usage"), dict):
+            data["token_usage"] = TokenUsage(**data["token_usage"])
+        if "todos" in data:
+            data["todos"] = [Todo(**todo) if isinstance(todo, dict) else todo for todo in data["todos"]]
+        return cls(**data)
 
     def with_mode(self, mode: Literal["idle", "running", "blocked", "task"]) -> "AgentState":
-        return self.model_copy(update={"mode": mode})
+        return replace(self, mode=mode)
 
     def with_message(self, message: Dict[str, Any]) -> "AgentState":
-        return self.model_copy(update={"messages": self.messages + [message]})
+        return replace(self, messages=self.messages.append(message))
 
     def with_token_usage(self, usage: TokenUsage) -> "AgentState":
-        return self.model_copy(update={"token_usage": usage})
+        return replace(self, token_usage=usage)
 
     def with_cost(self, cost: float) -> "AgentState":
-        return self.model_copy(update={"total_cost": cost})
+        return replace(self, total_cost=cost)
 
     def with_context_window(self, percent: float) -> "AgentState":
-        return self.model_copy(update={"context_window_percent": percent})
+        return replace(self, context_window_percent=percent)
 
     def with_todos(self, todos: List[Todo]) -> "AgentState":
-        return self.model_copy(update={"todos": todos})
+        return replace(self, todos=todos)
 
     def with_task(self, task_id: Optional[str]) -> "AgentState":
-        return self.model_copy(update={"current_task_id": task_id})
-
+        return replace(self, current_task_id=task_id)
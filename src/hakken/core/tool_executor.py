@@ -1,8 +1,9 @@
-import json
+import asyncio
 import re
 from typing import TYPE_CHECKING
 
-from hakken.utils.json_utils import parse_tool_arguments
+from hakken.core.message_builder import text_block
+from hakken.utils.json_utils import dumps, parse_tool_arguments
 from hakken.prompts.reminders import get_reminders
 
 if TYPE_CHECKING:
@@ -12,10 +13,17 @@ if TYPE_CHECKING:
 class ToolExecutor:
     
     ERROR_PATTERNS = [
-        (r'File "([^"]+)", line (\d+)', r'File "\1:\2"'),
-        (r'^\s+at .+\n', ''),
-        (r'\n\s*\n+', '\n'),
+        (re.compile(r'File "([^"]+)", line (\d+)'), r'File "\1:\2"'),
+        (re.compile(r'^\s+at .+\n', re.MULTILINE), ''),
+        (re.compile(r'\n\s*\n+'), '\n'),
     ]
+
+    TOOL_CONCURRENCY_LIMIT = 8
+    READ_ONLY_TOOLS = frozenset({
+        "read_file", "list_dir", "grep_search", "file_search", "semantic_search",
+        "git_status", "git_diff", "git_log", "list_memories", "recall_memory",
+    })
+    CANCELLED_RESPONSE = "Tool execution was cancelled by the user before it completed."
     
     def __init__(
         self, 
@@ -28,20 +36,21 @@ class ToolExecutor:
         self._ui_manager = ui_manager
         self._add_message = add_message_callback
         self._max_error_length = max_error_length
+        self._tool_semaphore = asyncio.Semaphore(self.TOOL_CONCURRENCY_LIMIT)
 
     def _compact_error(self, error: str) -> str:
-        if len(error) <= self._max_error_length:
+        max_length = self._max_error_length
+        if len(error) <= max_length:
             return error
         
         for pattern, replacement in self.ERROR_PATTERNS:
-            error = re.sub(pattern, replacement, error, flags=re.MULTILINE)
-        
-        if len(error) <= self._max_error_length:
-            return error.strip()
+            error = pattern.sub(replacement, error)
+            if len(error) <= max_length:
+                return error.strip()
         
         lines = error.strip().split('\n')
         if len(lines) <= 6:
-            return error[:self._max_error_length]
+            return error[:max_length]
         
         head = '\n'.join(lines[:2])
         tail = '\n'.join(lines[-3:])
@@ -49,47 +58,86 @@ class ToolExecutor:
         return f"{head}\n[...{omitted} lines omitted...]\n{tail}"
 
     async def handle_tool_calls(self, tool_calls) -> None:
+        if not tool_calls:
+            return
+        responses = [None] * len(tool_calls)
+        try:
+            await self._collect_responses(tool_calls, responses)
+        except asyncio.CancelledError:
+            for i, tool_call in enumerate(tool_calls):
+                self._add_tool_response(tool_call, responses[i] if responses[i] is not None else self.CANCELLED_RESPONSE)
+            raise
+
+        reminder = get_reminders(self._tool_manager)
+        for tool_call, response in zip(tool_calls[:-1], responses):
+            self._add_tool_response(tool_call, response)
+        self._add_tool_response(tool_calls[-1], responses[-1], reminder=reminder)
+
+    async def _collect_responses(self, tool_calls, responses: list) -> None:
+        pending = []
+
         for i, tool_call in enumerate(tool_calls):
-            is_last_tool = (i == len(tool_calls) - 1)
-            
             args, error = parse_tool_arguments(tool_call.function.arguments)
             if error:
-                self._add_tool_response(tool_call, json.dumps({"error": error}), is_last_tool)
+                responses[i] = dumps({"error": error})
+                continue
+
+            need_user_approve = args.pop('need_user_approve', False)
+            if not need_user_approve and tool_call.function.name in self.READ_ONLY_TOOLS:
+                pending.append((i, tool_call, args))
                 continue
 
-            need_user_approve = args.get('need_user_approve', False)
-            should_execute = True
+            await self._run_concurrently(pending, responses)
+            pending = []
 
-            if need_user_approve:
-                approval_content = f"Tool: {tool_call.function.name}, args: {args}"
-                should_execute, content = await self._ui_manager.wait_for_user_approval(approval_content)
+            if not need_user_approve:
+                responses[i] = await self._execute_tool(tool_call, args)
+                continue
 
+            approval_content = f"Tool: {tool_call.function.name}, args: {args}"
+            should_execute, content = await self._ui_manager.wait_for_user_approval(approval_content)
             if should_execute:
-                await self._execute_tool(tool_call, args, is_last_tool)
+                responses[i] = await self._execute_tool(tool_call, args)
             else:
-                self._add_tool_response(
-                    tool_call, 
-                    f"user denied to execute tool, user input: {content}", 
-                    is_last_tool
-                )
-
-    async def _execute_tool(self, tool_call, args: dict, is_last_tool: bool = False) -> None:
-        tool_args = {k: v for k, v in args.items() if k != 'need_user_approve'}
+                responses[i] = f"user denied to execute tool, user input: {content}"
+
+        await self._run_concurrently(pending, responses)
+
+    async def _run_concurrently(self, pending: list, responses: list) -> None:
+        if not pending:
+            return
+        if len(pending) == 1:
+            i, tool_call, args = pending[0]
+            responses[i] = await self._execute_tool(tool_call, args)
+            return
+        await asyncio.gather(
+            *(self._execute_into(responses, i, tool_call, args) for i, tool_call, args in pending)
+        )
+
+    async def _execute_into(self, responses: list, i: int, tool_call, tool_args: dict) -> None:
+        responses[i] = await self._execute_tool(tool_call, tool_args)
+
+    async def _execute_tool(self, tool_call, tool_args: dict) -> str:
         self._ui_manager.show_preparing_tool(tool_call.function.name, tool_args)
         
-        tool_response = await self._safe_run_tool(tool_call.function.name, tool_args)
+        async with self._tool_semaphore:
+            tool_response = await self._safe_run_tool(tool_call.function.name, tool_args)
         success = "error" not in tool_response
+        response_str = dumps(tool_response)
         
         self._ui_manager.show_tool_execution(
             tool_call.function.name, 
             tool_args, 
             success=success, 
-            result=str(tool_response)
+            result=response_str
         )
-        self._add_tool_response(tool_call, json.dumps(tool_response), is_last_tool)
+        return response_str
 
     async def _safe_run_tool(self, tool_name: str, tool_args: dict) -> dict:
-        result = await self._tool_manager.run_tool(tool_name, **tool_args)
+        try:
+            result = await self._tool_manager.run_tool(tool_name, **tool_args)
+        except Exception as e:
+            return {"error": self._compact_error(f"Error running {tool_name}: {e}")}
         if isinstance(result, str) and result.startswith("Error"):
             return {"error": self._compact_error(result)}
         if isinstance(result, dict) and "error" in result:
@@ -97,12 +145,8 @@ class ToolExecutor:
             return result
         return result if isinstance(result, dict) else {"result": result}
 
-    def _add_tool_response(self, tool_call, content: str, is_last_tool: bool = False) -> None:
-        tool_content = [{"type": "text", "text": content}]
-        
-        if is_last_tool:
-            reminder_content = get_reminders(self._tool_manager)
-            tool_content.append({"type": "text", "text": reminder_content})
+    def _add_tool_response(self, tool_call, content: str, reminder: str = "") -> None:
+        tool_content = [text_block(content), text_block(reminder)] if reminder else [text_block(content)]
         
         tool_message = {
             "role": "tool",
@@ -1,13 +1,22 @@
 """History management module."""
 
-from hakken.history.manager import (
-    HistoryManager,
-    BaseHistoryManager,
-    Role,
-    Crop_Direction,
-)
-from hakken.history.tracer import TraceLogger, TraceSession
-from hakken.core.state import TokenUsage
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from hakken.history.manager import HistoryManager, BaseHistoryManager, Role, Crop_Direction
+    from hakken.history.tracer import TraceLogger, TraceSession
+    from hakken.core.state import TokenUsage
+
+_EXPORTS = {
+    "HistoryManager": "hakken.history.manager",
+    "BaseHistoryManager": "hakken.history.manager",
+    "Role": "hakken.history.manager",
+    "Crop_Direction": "hakken.history.manager",
+    "TraceLogger": "hakken.history.tracer",
+    "TraceSession": "hakken.history.tracer",
+    "TokenUsage": "hakken.core.state",
+}
 
 __all__ = [
     "HistoryManager",
@@ -17,4 +26,12 @@ __all__ = [
     "Crop_Direction",
     "TraceLogger",
     "TraceSession",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,17 +1,27 @@
 from abc import ABC, abstractmethod
-import copy
-import os
-from typing import TYPE_CHECKING, Dict, Optional, List, Any
-from dotenv import load_dotenv
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import re
+from typing import TYPE_CHECKING, Dict, Optional, List, Any, Tuple
 from enum import Enum
+from hakken.core.message_builder import CACHE_CONTROL, text_block
 from hakken.core.state import TokenUsage
 from hakken.history.tracer import TraceLogger, TraceSession
+from hakken.utils.env import env_float, env_int, env_list
+from hakken.utils.tokens import count_tokens
 
 if TYPE_CHECKING:
     from hakken.terminal_bridge import UIManager
     from hakken.core.client import APIClient
 
-load_dotenv()
+CACHE_BREAKPOINTS = ["post_system", "post_tail"]
+SUMMARY_RETENTION = {"user": 0.7, "assistant": 0.2}
+SUMMARY_MIN_CHARS = 200
+SUMMARY_TOOL_CHARS = 200
+CODE_BLOCK_PATTERN = re.compile(r"```.*?```", re.DOTALL)
+TOOL_RESULT_CLEARED = "[Tool result cleared to save context]"
 
 
 class Role(str, Enum):
@@ -21,11 +31,86 @@ class Role(str, Enum):
     ASSISTANT = "assistant"
 
 
+_SYSTEM = Role.SYSTEM.value
+_USER = Role.USER.value
+_TOOL = Role.TOOL.value
+_ASSISTANT = Role.ASSISTANT.value
+
+
 class Crop_Direction(str, Enum):
     TOP = "top"
     BOTTOM = "bottom"
 
 
+@dataclass(frozen=True)
+class PendingSummary:
+    future: "Future[str]"
+    depth: int
+    boundary: Dict[str, Any]
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get('content')
+    if isinstance(content, str):
+        parts = [content]
+    elif isinstance(content, list):
+        parts = [
+            block['text']
+            for block in content
+            if isinstance(block, dict) and isinstance(block.get('text'), str)
+        ]
+    else:
+        parts = []
+    
+    for tool_call in message.get('tool_calls') or []:
+        function = tool_call.get('function') if isinstance(tool_call, dict) else getattr(tool_call, 'function', None)
+        arguments = function.get('arguments') if isinstance(function, dict) else getattr(function, 'arguments', None)
+        if isinstance(arguments, str):
+            parts.append(arguments)
+    
+    return count_tokens("".join(parts))
+
+
+def message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get('text', '')
+            for block in content
+            if isinstance(block, dict) and isinstance(block.get('text'), str)
+        )
+    return ""
+
+
+def dedupe_code_blocks(text: str, code_blocks: Dict[str, str]) -> str:
+    def replace(match: "re.Match[str]") -> str:
+        block = match.group(0)
+        digest = hashlib.sha1(block.encode("utf-8")).hexdigest()[:8]
+        if digest in code_blocks:
+            return f"`[code:{digest}]`"
+        code_blocks[digest] = block
+        return block
+
+    return CODE_BLOCK_PATTERN.sub(replace, text)
+
+
+def clip_text(text: str, ratio: float) -> str:
+    limit = max(SUMMARY_MIN_CHARS, int(len(text) * ratio))
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "..."
+
+
+def copy_message(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is dict:
+        return {key: copy_message(item) for key, item in value.items()}
+    if value_type is list:
+        return [copy_message(item) for item in value]
+    return value
+
+
 class BaseHistoryManager(ABC):
     def __init__(self):
         self.messages_history = [[]]
@@ -73,27 +158,55 @@ class HistoryManager(BaseHistoryManager):
         compress_threshold: float = 0.8,
         trace_logger: Optional[TraceLogger] = None,
         initial_trace_metadata: Optional[Dict[str, Any]] = None,
+        cache_breakpoints: Optional[List[str]] = None,
     ):
         super().__init__()
         self._ui_manager = ui_manager
         self._api_client = api_client
-        self._model_max_tokens = int(os.getenv("MODEL_MAX_TOKENS", model_max_tokens)) * 1024
-        self._compress_threshold = float(os.getenv("COMPRESS_THRESHOLD", compress_threshold))
+        self._model_max_tokens = env_int("MODEL_MAX_TOKENS", model_max_tokens) * 1024
+        self._compress_threshold = env_float("COMPRESS_THRESHOLD", compress_threshold)
+        self._compression_trigger_tokens = int(self._compress_threshold * self._model_max_tokens)
+        self._context_window_cache: Tuple[int, str] = (0, "0.0")
         self._trace_logger = trace_logger or TraceLogger()
         self._trace_sessions: List[Optional[TraceSession]] = []
         self._initialize_trace_session(initial_trace_metadata or {"mode": "interactive", "chat_index": 0})
         self._tool_result_count = 0
+        self._token_estimates = [0]
+        self._system_indices: List[List[int]] = [[]]
+        self._user_indices: List[List[int]] = [[]]
+        self._tool_indices: List[List[int]] = [[]]
+        self._cache_anchor: Optional[Dict[str, Any]] = None
+        self._summary_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_summary: Optional[PendingSummary] = None
+        self._cache_breakpoints = set(
+            cache_breakpoints if cache_breakpoints is not None
+            else env_list("CACHE_BREAKPOINTS", CACHE_BREAKPOINTS)
+        )
 
     def add_message(self, message) -> None:
-        self.messages_history[-1].append(message)
+        role = message.get('role')
+        if isinstance(role, Role):
+            role = message['role'] = role.value
+        if role == _USER and self._pending_summary is not None:
+            self._apply_pending_summary()
+        current_messages = self.messages_history[-1]
+        message_index = len(current_messages)
+        current_messages.append(message)
+        self._token_estimates[-1] += estimate_message_tokens(message)
+        if role == _USER:
+            self._user_indices[-1].append(message_index)
+        elif role == _TOOL:
+            self._tool_indices[-1].append(message_index)
+        elif role == _SYSTEM:
+            self._system_indices[-1].append(message_index)
         if self._trace_logger:
             self._trace_logger.log_message(
                 self._current_trace_session,
                 message,
-                {"message_index": len(self.messages_history[-1]) - 1}
+                {"message_index": message_index}
             )
         
-        if message.get('role') == Role.TOOL:
+        if role == _TOOL:
             self.auto_clear_tool_results()
     
     def set_api_client(self, api_client: "APIClient") -> None:
@@ -108,14 +221,10 @@ class HistoryManager(BaseHistoryManager):
         if len(current_messages) < crop_amount + 2:
             return "Cannot crop: invalid crop amount"
 
-        latest_user_index = -1
-        for i in range(len(current_messages) - 1, -1, -1):
-            if current_messages[i]['role'] == Role.USER:
-                latest_user_index = i
-                break
-        
-        if latest_user_index == -1:
+        user_indices = self._user_indices[-1]
+        if not user_indices:
             return "Cannot crop: no user messages found"
+        latest_user_index = user_indices[-1]
 
         if crop_direction == Crop_Direction.TOP:
             max_crop_amount = latest_user_index
@@ -126,19 +235,31 @@ class HistoryManager(BaseHistoryManager):
             return "Cannot crop: can't crop the latest user message"
 
         if crop_direction == Crop_Direction.TOP:
-            system_messages = [msg for msg in current_messages if msg['role'] == Role.SYSTEM]
-            cropped_messages = system_messages + current_messages[crop_amount:]
+            system_indices = self._system_indices[-1]
+            system_count = bisect_left(system_indices, crop_amount)
+            current_messages[:crop_amount] = [current_messages[i] for i in system_indices[:system_count]]
+            self._shift_role_indices(crop_amount, system_count - crop_amount)
+            self._system_indices[-1][:0] = range(system_count)
         else:
-            cropped_messages = current_messages[:-crop_amount]
+            del current_messages[-crop_amount:]
+            self._trim_role_indices(len(current_messages))
         
-        self.messages_history[-1] = cropped_messages
+        self._recalculate_token_estimate()
         return "Crop message successful"
 
     @property
     def current_context_window(self):
         if not self.history_token_usage or self._model_max_tokens == 0:
             return "0.0"
-        return f"{100 * self.history_token_usage[-1].total_tokens / self._model_max_tokens:.1f}"
+        total_tokens = self.history_token_usage[-1].total_tokens
+        if total_tokens != self._context_window_cache[0]:
+            percent = f"{100 * total_tokens / self._model_max_tokens:.1f}"
+            self._context_window_cache = (total_tokens, percent)
+        return self._context_window_cache[1]
+
+    @property
+    def estimated_tokens(self) -> int:
+        return self._token_estimates[-1]
 
     @property
     def trace_logger(self) -> TraceLogger:
@@ -167,11 +288,51 @@ class HistoryManager(BaseHistoryManager):
             )
 
     def get_current_messages(self) -> any:
-        return copy.deepcopy(self.messages_history[-1])
+        return [copy_message(message) for message in self.messages_history[-1]]
+
+    def get_request_messages(self) -> List[Dict[str, Any]]:
+        messages = list(self.messages_history[-1])
+        if not messages:
+            return messages
+        
+        if "post_system" in self._cache_breakpoints and messages[0].get('role') == _SYSTEM:
+            self._mark_system_breakpoint(messages)
+        if "post_tail" in self._cache_breakpoints and messages[-1].get('content'):
+            self._mark_tail_breakpoint(messages)
+        return messages
+
+    def _mark_system_breakpoint(self, messages: List[Dict[str, Any]]) -> None:
+        content = messages[0].get('content')
+        if isinstance(content, str) and content:
+            messages[0] = {**messages[0], "content": [text_block(content, cache=True)]}
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            content[-1].setdefault("cache_control", CACHE_CONTROL)
+
+    def _mark_tail_breakpoint(self, messages: List[Dict[str, Any]]) -> None:
+        content = messages[-1]['content']
+        if isinstance(content, str):
+            self._move_cache_anchor(None)
+            messages[-1] = {**messages[-1], "content": [text_block(content, cache=True)]}
+        elif isinstance(content, list) and isinstance(content[-1], dict):
+            self._move_cache_anchor(content[-1])
+
+    def _move_cache_anchor(self, block: Optional[Dict[str, Any]]) -> None:
+        if block is self._cache_anchor:
+            return
+        if self._cache_anchor is not None:
+            self._cache_anchor.pop("cache_control", None)
+            self._cache_anchor = None
+        if block is not None and "cache_control" not in block:
+            block["cache_control"] = CACHE_CONTROL
+            self._cache_anchor = block
 
     def start_new_chat(self, metadata: Optional[Dict[str, Any]] = None) -> None:
         self.messages_history.append([])
-        self.history_token_usage.append(TokenUsage(0, 0, 0))
+        self._token_estimates.append(0)
+        self._system_indices.append([])
+        self._user_indices.append([])
+        self._tool_indices.append([])
+        self.history_token_usage.append(TokenUsage())
         trace_metadata = {"mode": "task", "chat_index": len(self._trace_sessions)}
         if metadata:
             trace_metadata.update(metadata)
@@ -180,6 +341,12 @@ class HistoryManager(BaseHistoryManager):
     def finish_chat_get_response(self) -> str:
         assert len(self.messages_history) >= 2, "there must more than or equal to 2 messages in history"
         task_messages = self.messages_history.pop()
+        self._token_estimates.pop()
+        self._system_indices.pop()
+        self._user_indices.pop()
+        self._tool_indices.pop()
+        if self._pending_summary and self._pending_summary.depth >= len(self.messages_history):
+            self._pending_summary = None
         self.history_token_usage.pop()
         finished_session = self._trace_sessions.pop() if self._trace_sessions else None
         if finished_session and self._trace_logger:
@@ -191,22 +358,41 @@ class HistoryManager(BaseHistoryManager):
         response = task_messages[-1]["content"]
         return response
 
+    def auto_messages_compression(self) -> None:
+        pending = self._pending_summary
+        if pending is not None and pending.depth == len(self.messages_history) - 1:
+            self._apply_pending_summary(wait=self._current_tokens() >= self._model_max_tokens)
+            return
+        if self._requires_compression():
+            self._compress_current_message(background=pending is None)
+
+    def _current_tokens(self) -> int:
+        estimated_tokens = self._token_estimates[-1]
+        token_usage = self.history_token_usage
+        if not token_usage:
+            return estimated_tokens
+        reported_tokens = token_usage[-1].total_tokens
+        return reported_tokens if reported_tokens > estimated_tokens else estimated_tokens
+
     def _requires_compression(self) -> bool:
-        if self._compress_threshold and self.history_token_usage:
-            current_usage = self.history_token_usage[-1]
-            return current_usage.total_tokens > self._compress_threshold * self._model_max_tokens
-        return False
+        if not self._compress_threshold:
+            return False
+        return self._current_tokens() > self._compression_trigger_tokens
 
-    def _compress_current_message(self) -> None:
+    def _compress_current_message(self, background: bool = False) -> None:
         self._ui_manager.print_assistant_message("History context too long, compressing...")
+        if self._pending_summary and self._pending_summary.depth == len(self.messages_history) - 1:
+            self._pending_summary = None
 
         current_messages = self.messages_history[-1]
-        user_indices = self._get_user_message_indices(current_messages)
+        user_indices = self._user_indices[-1]
         
         if len(user_indices) > 1:
-            self._compress_multiple_sessions_with_summary(current_messages, user_indices)
+            self._compress_multiple_sessions_with_summary(current_messages, user_indices, background)
         elif len(user_indices) == 1:
-            self._compress_single_session(current_messages, user_indices[0], 3)
+            self._compress_single_session(current_messages, user_indices[0], 3, self._system_indices[-1])
+            self._reindex_roles()
+            self._recalculate_token_estimate()
 
     @property
     def _current_trace_session(self) -> Optional[TraceSession]:
@@ -219,29 +405,41 @@ class HistoryManager(BaseHistoryManager):
         session = self._trace_logger.start_session(metadata) if self._trace_logger else None
         self._trace_sessions.append(session)
     
-    def _get_user_message_indices(self, messages: list) -> list[int]:
-        return [i for i, msg in enumerate(messages) if msg.get('role') == Role.USER]
-    
-    def _compress_multiple_sessions(self, messages: list, user_indices: list[int]) -> None:
-        second_oldest_user_index = user_indices[1]
-
-        system_messages = [
-            msg for msg in messages[:second_oldest_user_index] 
-            if msg.get('role') == Role.SYSTEM
-        ]
-        recent_messages = messages[second_oldest_user_index:]
-
-        self.messages_history[-1] = (
-            system_messages + self._create_compression_notice(messages) + recent_messages
+    def _recalculate_token_estimate(self) -> None:
+        self._token_estimates[-1] = sum(
+            estimate_message_tokens(msg) for msg in self.messages_history[-1]
         )
-
+    
+    def _shift_role_indices(self, cut: int, offset: int) -> None:
+        for role_indices in (self._system_indices, self._user_indices, self._tool_indices):
+            indices = role_indices[-1]
+            role_indices[-1] = [i + offset for i in indices[bisect_left(indices, cut):]]
+
+    def _trim_role_indices(self, length: int) -> None:
+        for role_indices in (self._system_indices, self._user_indices, self._tool_indices):
+            indices = role_indices[-1]
+            del indices[bisect_left(indices, length):]
+
+    def _reindex_roles(self) -> None:
+        system_indices: List[int] = []
+        user_indices: List[int] = []
+        tool_indices: List[int] = []
+        for i, msg in enumerate(self.messages_history[-1]):
+            role = msg.get('role')
+            if role == _USER:
+                user_indices.append(i)
+            elif role == _TOOL:
+                tool_indices.append(i)
+            elif role == _SYSTEM:
+                system_indices.append(i)
+        self._system_indices[-1] = system_indices
+        self._user_indices[-1] = user_indices
+        self._tool_indices[-1] = tool_indices
+    
     def _compress_single_session(
-        self, messages: list, user_index: int, delete_message_num: int
+        self, messages: list, user_index: int, delete_message_num: int, system_indices: list[int]
     ) -> None:
-        system_messages = [
-            msg for msg in messages[:user_index] 
-            if msg.get('role') == Role.SYSTEM
-        ]
+        system_messages = [messages[i] for i in system_indices if i < user_index]
         
         start_index = min(user_index + 1 + delete_message_num, len(messages))
         user_message = (
@@ -254,30 +452,30 @@ class HistoryManager(BaseHistoryManager):
 
     def _create_compression_notice(self, messages: list) -> list:
         compression_notice = {
-            "role": Role.USER,
+            "role": _USER,
             "content": "[Previous conversation history has been compressed to save context window space]"
         }
         return [compression_notice]
     
     def clear_old_tool_results(self, keep_last_n: int = 5) -> int:
         current_messages = self.messages_history[-1]
-        
-        tool_indices = [
-            i for i, msg in enumerate(current_messages) 
-            if msg.get('role') == Role.TOOL
-        ]
+        tool_indices = self._tool_indices[-1]
         
         if len(tool_indices) <= keep_last_n:
             return 0
         
-        indices_to_clear = tool_indices[:-keep_last_n]
         cleared_count = 0
+        # Older results are cleared oldest-first, so the first cleared one
+        # reached from the end means everything before it is cleared too.
+        for idx in reversed(tool_indices[:len(tool_indices) - keep_last_n]):
+            message = current_messages[idx]
+            if message['content'] == TOOL_RESULT_CLEARED:
+                break
+            message['content'] = TOOL_RESULT_CLEARED
+            cleared_count += 1
         
-        for idx in indices_to_clear:
-            if current_messages[idx]['content'] != "[Tool result cleared to save context]":
-                current_messages[idx]['content'] = "[Tool result cleared to save context]"
-                cleared_count += 1
-        
+        if cleared_count:
+            self._recalculate_token_estimate()
         return cleared_count
     
     def auto_clear_tool_results(self) -> None:
@@ -292,20 +490,27 @@ class HistoryManager(BaseHistoryManager):
     
     def _format_messages_for_summary(self, messages: list) -> str:
         formatted_lines = []
+        add_line = formatted_lines.append
+        code_blocks: Dict[str, str] = {}
+        default_ratio = SUMMARY_RETENTION[_ASSISTANT]
         
         for msg in messages:
             role = msg.get('role', 'unknown')
-            content = msg.get('content', '')
-            
-            if role == Role.SYSTEM:
+            if role == _SYSTEM:
                 continue
             
-            if role == Role.TOOL:
-                if content != "[Tool result cleared to save context]":
+            content = message_text(msg.get('content'))
+            if role == _TOOL:
+                if content != TOOL_RESULT_CLEARED:
+                    if len(content) > SUMMARY_TOOL_CHARS:
+                        content = content[:SUMMARY_TOOL_CHARS]
                     tool_name = msg.get('name', 'unknown_tool')
-                    formatted_lines.append(f"Tool({tool_name}): {content[:200]}...")
-            else:
-                formatted_lines.append(f"{role.upper()}: {content}")
+                    add_line(f"Tool({tool_name}): {content}...")
+            elif content:
+                if "```" in content:
+                    content = dedupe_code_blocks(content, code_blocks)
+                ratio = SUMMARY_RETENTION.get(role, default_ratio)
+                add_line(f"{role.upper()}: {clip_text(content, ratio)}")
         
         return "\n".join(formatted_lines)
     
@@ -323,7 +528,8 @@ class HistoryManager(BaseHistoryManager):
 4. User preferences and requirements
 5. Critical context for continuing work
 
-Discard redundant tool outputs and repeated information.
+Keep the user's requests close to verbatim; assistant turns can be condensed aggressively.
+Discard redundant tool outputs and repeated information. `[code:HASH]` refers to an earlier identical code block.
 
 Conversation:
 {history_text}
@@ -339,20 +545,52 @@ Provide focused summary (200-400 tokens):"""
         response, _ = self._api_client.get_completion(request_params)
         return response.content if response.content else "[Summary generation failed]"
     
-    def _compress_multiple_sessions_with_summary(self, messages: list, user_indices: list[int]) -> None:
+    def _compress_multiple_sessions_with_summary(
+        self, messages: list, user_indices: list[int], background: bool = False
+    ) -> None:
         second_oldest_user_index = user_indices[1]
         
         messages_to_compress = messages[:second_oldest_user_index]
-        system_messages = [
-            msg for msg in messages_to_compress
-            if msg.get('role') == Role.SYSTEM
-        ]
+        boundary = messages[second_oldest_user_index]
+        
+        if background and self._api_client:
+            if self._summary_executor is None:
+                self._summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-summary")
+            future = self._summary_executor.submit(self._compress_with_llm_summary, messages_to_compress)
+            self._pending_summary = PendingSummary(future, len(self.messages_history) - 1, boundary)
+            return
+        
+        self._splice_summary(boundary, self._compress_with_llm_summary(messages_to_compress))
+
+    def _apply_pending_summary(self, wait: bool = False) -> None:
+        pending = self._pending_summary
+        if pending is None or pending.depth != len(self.messages_history) - 1:
+            return
+        if not wait and not pending.future.done():
+            return
+        self._pending_summary = None
+        try:
+            summary = pending.future.result()
+        except Exception as e:
+            self._ui_manager.print_assistant_message(f"Background summary failed ({e}), dropping older messages instead.")
+            summary = "[Previous conversation compressed (LLM summarization failed)]"
+        self._splice_summary(pending.boundary, summary)
+
+    def _splice_summary(self, boundary: Dict[str, Any], summary: str) -> None:
+        messages = self.messages_history[-1]
+        boundary_index = next(
+            (i for i in self._user_indices[-1] if messages[i] is boundary), None
+        )
+        if boundary_index is None:
+            return
         
-        summary = self._compress_with_llm_summary(messages_to_compress)
+        system_messages = [messages[i] for i in self._system_indices[-1] if i < boundary_index]
         summary_message = {
-            "role": Role.USER,
+            "role": _USER,
             "content": f"[Previous Session Summary]\n{summary}"
         }
         
-        recent_messages = messages[second_oldest_user_index:]
-        self.messages_history[-1] = system_messages + [summary_message] + recent_messages
\ No newline at end of file
+        recent_messages = messages[boundary_index:]
+        self.messages_history[-1] = system_messages + [summary_message] + recent_messages
+        self._reindex_roles()
+        self._recalculate_token_estimate()
\ No newline at end of file
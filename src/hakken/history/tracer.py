@@ -1,12 +1,42 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import queue
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
+from weakref import WeakKeyDictionary
+
+from hakken.utils.env import env_bool, env_int
+from hakken.utils.json_utils import dump_line
+
+
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+_PRIMITIVE_BASES = (str, int, float, bool)
+_CONVERTERS: "WeakKeyDictionary[type, Optional[Callable[[Any], Any]]]" = WeakKeyDictionary()
+
+
+def _converter_for(value: Any) -> Optional[Callable[[Any], Any]]:
+    value_type = type(value)
+    try:
+        return _CONVERTERS[value_type]
+    except KeyError:
+        pass
+    if hasattr(value, "model_dump"):
+        converter = value_type.model_dump
+    elif hasattr(value, "dict"):
+        converter = value_type.dict
+    elif hasattr(value, "__dict__"):
+        converter = vars
+    else:
+        converter = None
+    _CONVERTERS[value_type] = converter
+    return converter
 
 
 @dataclass(frozen=True)
@@ -16,15 +46,29 @@ class TraceSession:
 
 
 class TraceLogger:
+    WRITE_BUFFER_SIZE = 1 << 16
+    QUEUE_SIZE = 4096
+    MAX_CONTENT = 4096
+    BATCH_SIZE = 64
+
     def __init__(
         self,
         base_dir: Optional[str] = None,
         enabled: Optional[bool] = None,
     ) -> None:
         self._enabled = self._resolve_enabled(enabled)
+        self._max_content = env_int("TRACE_MAX_CONTENT", self.MAX_CONTENT)
         self._base_dir = Path(base_dir or os.getenv("TRACE_DIR", "logs/traces")).expanduser()
+        self._files: Dict[Path, IO[bytes]] = {}
+        self._queue: "queue.Queue[Tuple[Path, Dict[str, Any]]]" = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._stamp_second: Optional[int] = None
+        self._stamp_prefix = ""
+        self.dropped = 0
         if self._enabled:
             self._base_dir.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.close)
 
     @property
     def enabled(self) -> bool:
@@ -45,7 +89,7 @@ class TraceLogger:
             {
                 "event": "session_start",
                 "session_id": session_id,
-                "ts": self._timestamp(),
+                "ts": time.time_ns(),
                 "metadata": self._make_json_safe(metadata or {}),
             },
         )
@@ -60,15 +104,37 @@ class TraceLogger:
         if not self._enabled or session is None:
             return
 
+        if self._max_content:
+            content = message.get("content")
+            truncated = self._truncate_content(content)
+            if truncated is not content:
+                message = {**message, "content": truncated}
         payload = {
             "event": "message",
             "session_id": session.id,
-            "ts": self._timestamp(),
+            "ts": time.time_ns(),
             "metadata": self._make_json_safe(metadata or {}),
             "message": self._make_json_safe(message),
         }
         self._write(session.path, payload)
 
+    def _truncate_content(self, content: Any) -> Any:
+        limit = self._max_content
+        if isinstance(content, str):
+            if len(content) > limit:
+                return f"{content[:limit]}...<truncated {len(content) - limit} chars>"
+            return content
+        if isinstance(content, list):
+            blocks = [
+                {**block, "text": self._truncate_content(block["text"])}
+                if isinstance(block, dict) and isinstance(block.get("text"), str) and len(block["text"]) > limit
+                else block
+                for block in content
+            ]
+            if any(new is not old for new, old in zip(blocks, content)):
+                return blocks
+        return content
+
     def log_event(
         self,
         session: Optional[TraceSession],
@@ -81,18 +147,80 @@ class TraceLogger:
         payload = {
             "event": event_name,
             "session_id": session.id,
-            "ts": self._timestamp(),
+            "ts": time.time_ns(),
             "details": self._make_json_safe(details or {}),
         }
         self._write(session.path, payload)
+        if event_name == "session_end":
+            self.flush()
+
+    def flush(self) -> None:
+        self._queue.join()
+        for trace_file in self._files.values():
+            trace_file.flush()
+
+    def close(self) -> None:
+        self._queue.join()
+        files, self._files = self._files, {}
+        for trace_file in files.values():
+            trace_file.close()
 
     def _write(self, file_path: Path, payload: Dict[str, Any]) -> None:
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        with file_path.open("a", encoding="utf-8") as trace_file:
-            trace_file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait((file_path, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def _start_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+                self._worker.start()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[Path, Dict[str, Any]]]) -> None:
+        lines: Dict[Path, List[bytes]] = {}
+        for file_path, payload in batch:
+            try:
+                payload["ts"] = self._format_timestamp(payload["ts"])
+                lines.setdefault(file_path, []).append(dump_line(payload))
+            except Exception:
+                self.dropped += 1
+        for file_path, file_lines in lines.items():
+            try:
+                self._write_now(file_path, b"".join(file_lines))
+            except Exception:
+                self.dropped += len(file_lines)
+
+    def _write_now(self, file_path: Path, data: bytes) -> None:
+        trace_file = self._files.get(file_path)
+        if trace_file is None:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            trace_file = file_path.open("ab", buffering=self.WRITE_BUFFER_SIZE)
+            self._files[file_path] = trace_file
+        trace_file.write(data)
 
-    def _timestamp(self) -> str:
-        return datetime.now(timezone.utc).isoformat()
+    def _format_timestamp(self, timestamp_ns: int) -> str:
+        second, nanos = divmod(timestamp_ns, 1_000_000_000)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp_prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._stamp_prefix}.{nanos // 1000:06d}+00:00"
 
     def _build_session_id(self, metadata: Optional[Dict[str, Any]]) -> str:
         if metadata and metadata.get("session_id"):
@@ -101,24 +229,31 @@ class TraceLogger:
         return f"trace-{timestamp}-{uuid4().hex[:6]}"
 
     def _make_json_safe(self, value: Any) -> Any:
-        if isinstance(value, (str, int, float, bool)) or value is None:
-            return value
-        if isinstance(value, dict):
-            return {str(k): self._make_json_safe(v) for k, v in value.items()}
-        if isinstance(value, (list, tuple, set)):
-            return [self._make_json_safe(v) for v in value]
-        if hasattr(value, "model_dump"):
-            return self._make_json_safe(value.model_dump())
-        if hasattr(value, "dict"):
-            return self._make_json_safe(value.dict())
-        if hasattr(value, "__dict__"):
-            return self._make_json_safe(vars(value))
-        return str(value)
+        root: Dict[int, Any] = {}
+        stack = [(value, root, 0)]
+        while stack:
+            item, parent, key = stack.pop()
+            item_type = type(item)
+            if item_type in _PRIMITIVE_TYPES or isinstance(item, _PRIMITIVE_BASES):
+                parent[key] = item
+            elif isinstance(item, dict):
+                converted = parent[key] = {}
+                for child_key, child in item.items():
+                    child_key = str(child_key)
+                    converted[child_key] = None
+                    stack.append((child, converted, child_key))
+            elif isinstance(item, (list, tuple, set)):
+                converted = parent[key] = [None] * len(item)
+                stack.extend((child, converted, index) for index, child in enumerate(item))
+            else:
+                converter = _converter_for(item)
+                if converter is None:
+                    parent[key] = str(item)
+                else:
+                    stack.append((converter(item), parent, key))
+        return root[0]
 
     def _resolve_enabled(self, explicit: Optional[bool]) -> bool:
         if explicit is not None:
             return explicit
-        env_value = os.getenv("TRACE_ENABLED")
-        if env_value is None:
-            return True
-        return env_value.strip().lower() in {"1", "true", "yes", "on"}
\ No newline at end of file
+        return env_bool("TRACE_ENABLED", True)
\ No newline at end of file
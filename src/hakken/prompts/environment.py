@@ -1,7 +1,8 @@
 import os
 import platform
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from datetime import date
 
 
 def get_working_directory() -> str:
@@ -9,7 +10,12 @@ def get_working_directory() -> str:
 
 
 def check_git_repository() -> str:
-    current_dir = Path(os.getcwd())
+    return _check_git_repository(os.getcwd())
+
+
+@lru_cache(maxsize=16)
+def _check_git_repository(cwd: str) -> str:
+    current_dir = Path(cwd)
     
     for path in [current_dir] + list(current_dir.parents):
         git_dir = path / '.git'
@@ -28,16 +34,23 @@ def get_os_version() -> str:
 
 
 def get_current_date() -> str:
-    today = datetime.now().strftime("%Y-%m-%d")
-    return f"Today's date: {today}"
+    return _format_date(date.today())
 
 
-def get_environment_info() -> str:
+@lru_cache(maxsize=1)
+def _format_date(today: date) -> str:
+    return f"Today's date: {today.isoformat()}"
+
+
+def get_session_info() -> str:
     info_parts = [
         get_working_directory(),
         check_git_repository(),
         get_platform(),
         get_os_version(),
-        get_current_date()
     ]
-    return "\n".join(info_parts)
\ No newline at end of file
+    return "\n".join(info_parts)
+
+
+def get_environment_info() -> str:
+    return f"{get_session_info()}\n{get_current_date()}"
\ No newline at end of file
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 import os
 from pathlib import Path
 
-from hakken.prompts.environment import get_environment_info
+from hakken.prompts.environment import get_current_date, get_session_info
 from hakken.prompts.system_rules import get_system_rules
 
 
@@ -22,11 +22,12 @@ class BasePromptManager(ABC):
 
 class PromptManager(BasePromptManager):
     def __init__(self):
-        pass
+        self._system_rules = get_system_rules()
+        self._session_info = get_session_info()
 
     def get_system_prompt(self) -> str:
         return f"""
-        {get_system_rules()}
-        {get_environment_info()}
+        {self._system_rules}
+        {self._session_info}\n{get_current_date()}
         {load_hakken_instructions()}
-        """.strip()
\ No newline at end of file
+        """.strip()
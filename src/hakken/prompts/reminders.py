@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -5,12 +6,17 @@ if TYPE_CHECKING:
 
 
 def get_reminders(tool_manager: "ToolManager") -> str:
-    todo_status = tool_manager.get_tool_status("todo_write")
+    if tool_manager.get_tool("todo_write") is None:
+        return ""
+    return _render_reminders(tool_manager.get_tool_status("todo_write"))
 
+
+@lru_cache(maxsize=32)
+def _render_reminders(todo_status: str) -> str:
     return f"""
 <reminder>
 ## Current Todo Status
 {todo_status}
 Remember to check and update your todos using tool todo_write regularly to stay organized and productive.
 </reminder>
-""".strip()
\ No newline at end of file
+""".strip()
@@ -1,3 +1,8 @@
+import sys
+from types import MappingProxyType
+from typing import Mapping
+
+
 GENERAL_PURPOSE_PROMPT = """
 You are an agent for Hakken, an autonomous coding CLI.
 Given the user's message, you should use the tools available to complete the task.
@@ -50,18 +55,36 @@ Make minimal, safe changes. Verify behavior is preserved.
 """
 
 
+MEMORY_REUSE_GUIDELINE = (
+    "Check previous tool responses in the conversation history before making new tool calls. "
+    "Extract data from previous tool outputs instead of calling tools again with the same parameters. "
+    "Only make new calls if the data is unavailable or the parameters differ."
+)
+
+
+def with_memory_guard(prompt: str) -> str:
+    return f"{prompt.rstrip()}\n\n{MEMORY_REUSE_GUIDELINE}\n"
+
+
+SUBAGENT_PROMPTS = MappingProxyType({
+    sys.intern("general-purpose"): with_memory_guard(GENERAL_PURPOSE_PROMPT),
+    sys.intern("code-review"): with_memory_guard(CODE_REVIEW_PROMPT),
+    sys.intern("test-writer"): with_memory_guard(TEST_WRITER_PROMPT),
+    sys.intern("refactor"): with_memory_guard(REFACTOR_PROMPT),
+})
+
+
 class SubagentManager:
     def __init__(self):
-        self._system_prompt_map = {}
-        self.register_subagent_prompt("general-purpose", GENERAL_PURPOSE_PROMPT)
-        self.register_subagent_prompt("code-review", CODE_REVIEW_PROMPT)
-        self.register_subagent_prompt("test-writer", TEST_WRITER_PROMPT)
-        self.register_subagent_prompt("refactor", REFACTOR_PROMPT)
+        self._system_prompt_map: Mapping[str, str] = SUBAGENT_PROMPTS
     
     def get_subagent_prompt(self, prompt_type: str) -> str:
-        if prompt_type not in self._system_prompt_map:
+        prompt = self._system_prompt_map.get(prompt_type)
+        if prompt is None:
             raise ValueError(f"subagent type '{prompt_type}' not found")
-        return self._system_prompt_map[prompt_type]
+        return prompt
 
-    def register_subagent_prompt(self, prompt_type: str, prompt: str) -> None:
-        self._system_prompt_map[prompt_type] = prompt
\ No newline at end of file
+    def register_subagent_prompt(self, prompt_type: str, prompt: str, append_memory_guard: bool = True) -> None:
+        if append_memory_guard:
+            prompt = with_memory_guard(prompt)
+        self._system_prompt_map = {**self._system_prompt_map, sys.intern(prompt_type): prompt}
@@ -2,11 +2,24 @@ import sys
 import json
 import asyncio
 import os
-from typing import Optional, Any, Callable, Tuple, List, Dict, TYPE_CHECKING
+from typing import Optional, Any, Callable, Tuple, List, Dict, Set, TYPE_CHECKING
+
+from hakken.core.message_builder import MessageBuilder
+from hakken.utils.json_utils import dump_ascii, loads
 
 if TYPE_CHECKING:
     from hakken.core.state import AgentState
 
+DROPPABLE_MESSAGES = frozenset({"stream_chunk"})
+EMIT_BUFFER_LIMIT = 8 * 1024 * 1024
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+FRAME_PREFIX = b"__MSG__"
+FRAME_SUFFIX = b"__END__\n"
+TODO_STATUS_ICONS = {"pending": "⬜", "in_progress": "🔄", "completed": "✅"}
+DEFAULT_TODO_ICON = TODO_STATUS_ICONS["pending"]
+# Shared payload for frames without data; Bridge.emit only serializes it.
+EMPTY_DATA: Dict[str, Any] = {}
+
 
 class UIManager:
     def __init__(self, send_callback: Optional[Callable[[str, Any], None]] = None):
@@ -48,7 +61,7 @@ class UIManager:
     def start_stream_display(self):
         self._streaming = True
         if self._is_bridge_mode:
-            self._send("stream_start", {})
+            self._send("stream_start")
     
     def print_streaming_content(self, chunk: str):
         if self._is_bridge_mode:
@@ -59,7 +72,7 @@ class UIManager:
     def stop_stream_display(self):
         self._streaming = False
         if self._is_bridge_mode:
-            self._send("stream_end", {})
+            self._send("stream_end")
         else:
             print()
     
@@ -97,11 +110,11 @@ class UIManager:
         if self._is_bridge_mode:
             self._send("todos", {"items": todos})
         else:
-            print("\n📋 Todo List:")
+            lines = ["\n📋 Todo List:"]
             for todo in todos:
-                status_icon = {"pending": "⬜", "in_progress": "🔄", "completed": "✅"}.get(todo.get("status", "pending"), "⬜")
-                print(f"  {status_icon} [{todo.get('id', '?')}] {todo.get('content', '')}")
-            print()
+                status_icon = TODO_STATUS_ICONS.get(todo.get("status"), DEFAULT_TODO_ICON)
+                lines.append(f"  {status_icon} [{todo.get('id', '?')}] {todo.get('content', '')}")
+            print("\n".join(lines) + "\n")
 
 
 class Bridge:
@@ -111,12 +124,70 @@ class Bridge:
         self.agent = None
         self.ui: Optional[UIManager] = None
         self.task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
         self.stop_requested = False
         self.state = AgentState()
+        self._warmup: Optional[asyncio.Future] = None
+        self._out = bytearray()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._out_ready: Optional[asyncio.Event] = None
+        self._closing = False
+        self._output_closed = False
         
     def emit(self, msg_type: str, data: Any = None):
-        output = f"__MSG__{json.dumps({'type': msg_type, 'data': data or {}})}__END__"
-        print(output, flush=True)
+        out = self._out
+        if self._output_closed or (msg_type in DROPPABLE_MESSAGES and len(out) >= EMIT_BUFFER_LIMIT):
+            return
+        out += FRAME_PREFIX
+        out += dump_ascii({"type": msg_type, "data": data or EMPTY_DATA})
+        out += FRAME_SUFFIX
+        if self._writer_task is None:
+            self.flush()
+        else:
+            self._out_ready.set()
+
+    def flush(self):
+        if not self._out:
+            return
+        if not self._output_closed:
+            self._write(self._out)
+        self._out.clear()
+
+    def _write(self, data):
+        try:
+            stdout = sys.stdout
+            stdout.flush()
+            stdout.buffer.write(data)
+            stdout.buffer.flush()
+        except OSError:
+            self._output_closed = True
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._out_ready.wait()
+            self._out_ready.clear()
+            while self._out:
+                data = bytes(self._out)
+                self._out.clear()
+                await loop.run_in_executor(None, self._write, data)
+                if self._output_closed:
+                    self._out.clear()
+                    return
+            if self._closing:
+                return
+
+    def _start_writer(self):
+        self._out_ready = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _stop_writer(self):
+        if self._writer_task is None:
+            return
+        self._closing = True
+        self._out_ready.set()
+        await self._writer_task
+        self._writer_task = None
 
     def set_turn_status(self, mode: str, reason: str = ""):
         self.state = self.state.with_mode(mode)
@@ -132,19 +203,11 @@ class Bridge:
         if not messages or len(messages) <= 1:
             return
 
-        notice = {
-            "role": "system",
-            "content": [
-                {
-                    "type": "text",
-                    "text": (
-                        "Execution was interrupted by the user before it completed. "
-                        "When you respond next, briefly acknowledge the interruption and wait for the user's "
-                        "instructions before resuming any outstanding work."
-                    )
-                }
-            ]
-        }
+        notice = MessageBuilder.create_system_message(
+            "Execution was interrupted by the user before it completed. "
+            "When you respond next, briefly acknowledge the interruption and wait for the user's "
+            "instructions before resuming any outstanding work."
+        )
         self.agent.add_message(notice)
     
     def create_agent(self):
@@ -155,10 +218,12 @@ class Bridge:
     async def handle_input(self, message: str):
         self.stop_requested = False
         self.set_turn_status("running", "processing user request")
-        msg = {"role": "user", "content": [{"type": "text", "text": message}]}
+        msg = MessageBuilder.create_user_message(message)
         self.state = self.state.with_message(msg)
         self.agent.add_message(msg)
         try:
+            if self._warmup:
+                await self._warmup
             await self.agent._recursive_message_handling()
         except Exception as e:
             self.emit("error", {"message": str(e), "type": type(e).__name__})
@@ -173,17 +238,33 @@ class Bridge:
         if self.ui:
             self.ui.resolve_approval(approved, content)
     
-    async def handle_stop(self):
-        self.stop_requested = True
-        had_active_task = self.task and not self.task.done()
-        if had_active_task:
-            self.task.cancel()
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        self.task = task
+        return task
+
+    async def _queue_input(self, message: str, previous: Optional[asyncio.Task]):
+        if previous is not None:
             try:
-                await self.task
+                await previous
             except asyncio.CancelledError:
-                pass
-            finally:
-                self.task = None
+                return
+        await self.handle_input(message)
+
+    async def _cancel_pending(self) -> bool:
+        tasks = [task for task in self._pending if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+        return bool(tasks)
+
+    async def handle_stop(self):
+        self.stop_requested = True
+        if await self._cancel_pending():
             self._record_stop_notice()
         if self.ui:
             self.ui.resolve_approval(False, "agent stopped")
@@ -193,14 +274,8 @@ class Bridge:
     async def handle_interrupt(self, message: str):
         self.stop_requested = True
         self.set_turn_status("interrupted", "user forced new input")
-        if self.task and not self.task.done():
-            self.task.cancel()
-            try:
-                await self.task
-            except asyncio.CancelledError:
-                pass
-        self.task = asyncio.create_task(self.handle_input(message))
-        await self.task
+        await self._cancel_pending()
+        self._spawn(self.handle_input(message))
     
     async def process(self, msg: dict):
         msg_type = msg.get("type")
@@ -208,8 +283,8 @@ class Bridge:
         
         try:
             if msg_type == "user_input":
-                self.task = asyncio.create_task(self.handle_input(data.get("message", "")))
-                await self.task
+                previous = self.task if self.task and not self.task.done() else None
+                self._spawn(self._queue_input(data.get("message", ""), previous))
             elif msg_type == "tool_approval":
                 await self.handle_approval(data.get("approved", False), data.get("content", ""))
             elif msg_type == "stop_agent":
@@ -223,37 +298,78 @@ class Bridge:
             self.set_turn_status("error", f"Unhandled error: {str(e)[:200]}")
     
     async def read_stdin(self):
-        loop = asyncio.get_event_loop()
+        reader = await self._open_stdin_reader()
+        if reader is None:
+            await self._read_stdin_threaded()
+            return
         while True:
             try:
-                line = await loop.run_in_executor(None, sys.stdin.readline)
-                if not line:
-                    break
-                line = line.strip()
-                if not line:
-                    continue
-                await self.process(json.loads(line))
-            except json.JSONDecodeError as e:
-                self.emit("error", {"message": f"Invalid JSON input: {str(e)}", "type": "JSONDecodeError"})
-            except Exception as e:
+                line = await reader.readline()
+            except ValueError as e:
                 self.emit("error", {"message": str(e), "type": type(e).__name__})
+                continue
+            if not line:
+                break
+            await self._process_line(line)
+
+    async def _open_stdin_reader(self) -> Optional[asyncio.StreamReader]:
+        if sys.platform == "win32":
+            return None
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        except (ValueError, OSError):
+            return None
+        return reader
+
+    async def _read_stdin_threaded(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            await self._process_line(line)
+
+    async def _process_line(self, line):
+        try:
+            if not line or line.isspace():
+                return
+            await self.process(loads(line))
+        except json.JSONDecodeError as e:
+            self.emit("error", {"message": f"Invalid JSON input: {str(e)}", "type": "JSONDecodeError"})
+        except Exception as e:
+            self.emit("error", {"message": str(e), "type": type(e).__name__})
     
     async def run(self):
         work_dir = os.environ.get("HAKKEN_WORK_DIR")
         if work_dir:
             os.chdir(work_dir)
+        self._start_writer()
         self.emit("environment_info", {"working_directory": os.getcwd()})
         self.create_agent()
-        self.agent.add_message({
-            "role": "system",
-            "content": [{"type": "text", "text": self.agent._prompt_manager.get_system_prompt()}]
-        })
+        self.agent.add_message(
+            MessageBuilder.create_system_message(self.agent.system_prompt, cache=True)
+        )
+        self._warmup = asyncio.get_running_loop().run_in_executor(None, self.agent.warm_caches)
         self.set_turn_status("idle", "waiting for input")
         self.emit("ready")
-        await self.read_stdin()
+        try:
+            await self.read_stdin()
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+        finally:
+            try:
+                await self._stop_writer()
+                self.flush()
+            finally:
+                from hakken.core.client import close_shared_http_clients
+                await close_shared_http_clients()
 
 
 def main():
+    from hakken.utils.env import load_env_file
+    load_env_file()
     asyncio.run(Bridge().run())
 
 
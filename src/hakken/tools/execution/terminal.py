@@ -1,4 +1,8 @@
-import subprocess
+import asyncio
+import os
+import signal
+import sys
+from typing import Tuple
 from hakken.tools.base import BaseTool
 
 
@@ -19,6 +23,52 @@ Best practices:
 
 Returns command output on success, or error message with exit code on failure."""
 
+TOOL_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": "cmd_runner",
+        "description": TOOL_DESCRIPTION,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "need_user_approve": {
+                    "type": "boolean",
+                    "description": "Whether the command requires explicit user approval before execution",
+                    "default": True
+                },
+                "command": {
+                    "type": "string",
+                    "description": "The shell command to execute"
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": "Maximum number of seconds to wait for the command to finish",
+                    "default": 30
+                }
+            },
+            "required": ["need_user_approve", "command"]
+        }
+    }
+}
+
+MAX_OUTPUT_BYTES = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_capped(stream: asyncio.StreamReader) -> Tuple[str, bool]:
+    data = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        room = MAX_OUTPUT_BYTES - len(data)
+        if len(chunk) > room:
+            truncated = True
+            chunk = chunk[:max(room, 0)]
+        data += chunk
+    return data.decode(errors="replace"), truncated
+
 
 class CmdRunner(BaseTool):
     def __init__(self):
@@ -32,53 +82,54 @@ class CmdRunner(BaseTool):
         if not command:
             return "Error: No command provided. Provide a shell command to execute."
         
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=sys.platform != "win32",
+        )
+        output = asyncio.gather(_read_capped(process.stdout), _read_capped(process.stderr), process.wait())
         try:
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout
+            (stdout, stdout_truncated), (stderr, stderr_truncated), returncode = await asyncio.wait_for(
+                output,
+                timeout=timeout,
             )
-            
-            if result.returncode == 0:
-                if result.stdout.strip():
-                    return result.stdout
-                else:
-                    return "Command executed successfully (no output)"
-            else:
-                return f"Command failed with exit code {result.returncode}:\n{result.stderr}"
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return f"Command timed out after {timeout} seconds. Consider increasing the timeout parameter or simplifying the command."
+        finally:
+            if process.returncode is None:
+                self._kill(process)
+                await process.wait()
+            output.cancel()
+            await asyncio.gather(output, return_exceptions=True)
+        
+        if returncode == 0:
+            if stdout.strip():
+                return self._with_truncation_notice(stdout, stdout_truncated)
+            else:
+                return "Command executed successfully (no output)"
+        else:
+            return f"Command failed with exit code {returncode}:\n{self._with_truncation_notice(stderr, stderr_truncated)}"
+
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process) -> None:
+        if sys.platform == "win32":
+            process.kill()
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def _with_truncation_notice(output: str, truncated: bool) -> str:
+        if truncated:
+            return f"{output}\n[output truncated at {MAX_OUTPUT_BYTES} bytes]"
+        return output
 
     def json_schema(self):
-        return {
-            "type": "function",
-            "function": {
-                "name": self.get_tool_name(),
-                "description": TOOL_DESCRIPTION,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "need_user_approve": {
-                            "type": "boolean",
-                            "description": "Whether the command requires explicit user approval before execution",
-                            "default": True
-                        },
-                        "command": {
-                            "type": "string",
-                            "description": "The shell command to execute"
-                        },
-                        "timeout": {
-                            "type": "integer",
-                            "description": "Maximum number of seconds to wait for the command to finish",
-                            "default": 30
-                        }
-                    },
-                    "required": ["need_user_approve", "command"]
-                }
-            }
-        }
+        return TOOL_SCHEMA
     
     def get_status(self):
         return ""
\ No newline at end of file
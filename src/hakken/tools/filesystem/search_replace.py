@@ -42,15 +42,26 @@ class SearchReplaceTool(BaseTool):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        if search_string not in content:
-            return f"Error: Search string '{search_string}' not found in file: {file_path}. Verify the exact string exists or use grep_search to find similar patterns."
+        if not search_string:
+            return "Error: search_string is required"
 
-        if count is not None:
-            new_content = content.replace(search_string, replace_string, count)
-            occurrences = count
+        if count is None:
+            count = -1
         else:
-            occurrences = content.count(search_string)
-            new_content = content.replace(search_string, replace_string)
+            try:
+                count = int(count)
+            except (TypeError, ValueError):
+                return f"Error: count must be a positive integer. Got: {count!r}"
+            if count <= 0:
+                return f"Error: count must be a positive integer. Got: {count}"
+
+        parts = content.split(search_string, count)
+        occurrences = len(parts) - 1
+
+        if occurrences == 0:
+            return f"Error: Search string '{search_string}' not found in file: {file_path}. Verify the exact string exists or use grep_search to find similar patterns."
+
+        new_content = replace_string.join(parts)
 
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
@@ -1,3 +1,4 @@
+import importlib
 from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from hakken.tools.base import BaseTool
@@ -17,6 +18,7 @@ TOOL_REGISTRY = {
     "list_dir": ("hakken.tools.filesystem.list_dir", "ListDirTool"),
     "add_memory": ("hakken.tools.memory.add", "AddMemoryTool"),
     "list_memories": ("hakken.tools.memory.list", "ListMemoriesTool"),
+    "recall_memory": ("hakken.tools.memory.recall", "RecallMemoryTool"),
     "semantic_search": ("hakken.tools.search.semantic_search", "SemanticSearchTool"),
     "file_search": ("hakken.tools.search.file_search", "FileSearchTool"),
     "grep_search": ("hakken.tools.search.grep_search", "GrepSearchTool"),
@@ -31,6 +33,13 @@ TOOL_REGISTRY = {
     "scratchpad": ("hakken.tools.utilities.scratchpad", "ScratchpadTool"),
 }
 
+TOOL_DEPENDENCIES = {
+    "context_compression": (("history_manager",), True),
+    "todo_write": (("ui_manager",), True),
+    "task": (("subagent_manager", "ui_manager"), True),
+    "scratchpad": (("ui_manager",), False),
+}
+
 
 class ToolManager:
     
@@ -46,6 +55,8 @@ class ToolManager:
         self.ui_manager = ui_manager
         self.subagent_manager = subagent_manager
         self._tools_initialized = False
+        self._tools_description: Optional[List[Dict[str, Any]]] = None
+        self.version = 0
 
     def _ensure_tools_loaded(self):
         if self._tools_initialized:
@@ -53,36 +64,33 @@ class ToolManager:
         self._tools_initialized = True
         
         for name, (module_path, class_name) in TOOL_REGISTRY.items():
-            if name == "context_compression" and not self.history_manager:
-                continue
-            if name == "todo_write" and not self.ui_manager:
-                continue
-            if name == "task" and not (self.subagent_manager and self.ui_manager):
+            dependencies, required = TOOL_DEPENDENCIES.get(name, ((), False))
+            kwargs = {dep: getattr(self, dep) for dep in dependencies}
+            if required and not all(kwargs.values()):
                 continue
             
             try:
-                import importlib
                 module = importlib.import_module(module_path)
                 tool_class = getattr(module, class_name)
-                
-                if name == "context_compression":
-                    self.tools[name] = tool_class(history_manager=self.history_manager)
-                elif name == "todo_write":
-                    self.tools[name] = tool_class(ui_manager=self.ui_manager)
-                elif name == "task":
-                    self.tools[name] = tool_class(
-                        subagent_manager=self.subagent_manager,
-                        ui_manager=self.ui_manager
-                    )
-                elif name == "scratchpad":
-                    self.tools[name] = tool_class(ui_manager=self.ui_manager)
-                else:
-                    self.tools[name] = tool_class()
+                self.tools[name] = tool_class(**kwargs)
             except Exception:
                 pass
 
+    # Tool schemas are part of every request prefix: changing the tool set
+    # mid-session invalidates the provider's prompt cache, so recall data
+    # through tool calls rather than by editing prompts or tools.
     def register_tool(self, tool: BaseTool):
         self.tools[tool.get_tool_name()] = tool
+        self._tools_changed()
+
+    def unregister_tool(self, name: str) -> None:
+        self._ensure_tools_loaded()
+        if self.tools.pop(name, None) is not None:
+            self._tools_changed()
+
+    def _tools_changed(self) -> None:
+        self._tools_description = None
+        self.version += 1
 
     def get_tool(self, name: str) -> Optional[BaseTool]:
         self._ensure_tools_loaded()
@@ -90,7 +98,9 @@ class ToolManager:
 
     def get_tools_description(self) -> List[Dict[str, Any]]:
         self._ensure_tools_loaded()
-        return [tool.json_schema() for tool in self.tools.values()]
+        if self._tools_description is None:
+            self._tools_description = [tool.json_schema() for tool in self.tools.values()]
+        return self._tools_description
 
     def get_tool_status(self, tool_name: str) -> str:
         tool = self.get_tool(tool_name)
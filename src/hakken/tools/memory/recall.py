@@ -0,0 +1,79 @@
+from hakken.tools.base import BaseTool
+
+
+TOOL_DESCRIPTION = """Search stored repository knowledge for entries relevant to a query.
+
+Use this tool to:
+- Recall conventions, design decisions, or configuration details related to the current work
+- Check what is already known about a module or dependency before exploring the code again
+
+Prefer this over list_memories when only a few entries are relevant. Knowledge is stored with add_memory."""
+
+
+class RecallMemoryTool(BaseTool):
+    def __init__(self, memory_file=".hakken_memories.json"):
+        super().__init__()
+        self.memory_file = memory_file
+    
+    @staticmethod
+    def get_tool_name():
+        return "recall_memory"
+    
+    async def act(self, query, limit=5):
+        if not query:
+            return "Error: query is required"
+        
+        from hakken.utils.json_store import read_json_file
+        
+        error, memories = read_json_file(self.memory_file, [])
+        if error:
+            return f"Error: {error}"
+        if not memories:
+            return "No knowledge entries found. Use add_memory to store repository-specific knowledge."
+        
+        terms = set(query.lower().split())
+        scored = []
+        for index, memory in enumerate(memories):
+            text = str(memory).lower()
+            score = sum(1 for term in terms if term in text)
+            if score:
+                scored.append((-score, index, memory))
+        
+        if not scored:
+            return f"No knowledge entries match '{query}'."
+        
+        scored.sort()
+        matches = scored[:limit]
+        result = f"Knowledge matching '{query}':\n"
+        for _, index, memory in matches:
+            result += f"{index + 1}. {memory}\n"
+        result += f"Showing {len(matches)} of {len(scored)} matching entries"
+        
+        return result
+    
+    def json_schema(self):
+        return {
+            "type": "function",
+            "function": {
+                "name": self.get_tool_name(),
+                "description": TOOL_DESCRIPTION,
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Words describing the knowledge to recall"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of entries to return",
+                            "default": 5
+                        }
+                    },
+                    "required": ["query"]
+                }
+            }
+        }
+    
+    def get_status(self):
+        return "ready"
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import TYPE_CHECKING, List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from hakken.tools.base import BaseTool
 
 if TYPE_CHECKING:
@@ -131,6 +131,7 @@ class TodoTool(BaseTool):
         self.todo_file = todo_file
         self.todo_md_file = todo_md_file
         self.todos: List[Dict[str, Any]] = []
+        self._status_cache: Optional[Tuple[Tuple[int, int], str]] = None
     
     @staticmethod
     def get_tool_name():
@@ -161,6 +162,7 @@ class TodoTool(BaseTool):
                 return f"Error: todo item {i} has invalid status '{todo['status']}'. Must be one of: {', '.join(valid_statuses)}"
         
         self.todos = todos
+        self._status_cache = None
         self._save_todos(todos)
         self._update_ui(todos)
         
@@ -282,7 +284,21 @@ class TodoTool(BaseTool):
         }
     
     def get_status(self):
-        todos = self._load_todos()
+        try:
+            stat = os.stat(self.todo_file)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if key is not None and self._status_cache and self._status_cache[0] == key:
+            return self._status_cache[1]
+
+        status = self._compute_status(self._load_todos() if key is not None else [])
+        if key is not None:
+            self._status_cache = (key, status)
+        return status
+
+    @staticmethod
+    def _compute_status(todos: List[Dict[str, Any]]) -> str:
         if not todos:
             return "ready (no active todos)"
         pending = len([t for t in todos if t.get('status') == 'pending'])
@@ -0,0 +1,49 @@
+import os
+
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+_env_file_loaded = False
+
+
+def load_env_file() -> None:
+    global _env_file_loaded
+    if _env_file_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_file_loaded = True
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def env_list(name: str, default: list[str]) -> list[str]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value.strip())
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value.strip())
+    except ValueError:
+        return default
@@ -1,7 +1,13 @@
 import os
+import tempfile
 from typing import Optional, Tuple
 
 
+_known_dirs: set[str] = set()
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
 def validate_absolute_path(path: str) -> Optional[str]:
     if not path:
         return "Path is required"
@@ -51,17 +57,56 @@ def write_file_content(path: str, content: str, create_dirs: bool = True) -> Opt
     if error:
         return error
     
-    if create_dirs:
-        dir_path = os.path.dirname(path)
-        if dir_path:
-            os.makedirs(dir_path, exist_ok=True)
+    data = content.encode('utf-8')
+    dir_path = os.path.dirname(path)
+    
+    if create_dirs and dir_path and dir_path not in _known_dirs:
+        os.makedirs(dir_path, exist_ok=True)
+        _known_dirs.add(dir_path)
     
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    try:
+        _atomic_write(path, data)
+    except FileNotFoundError:
+        if not (create_dirs and dir_path):
+            raise
+        _known_dirs.discard(dir_path)
+        os.makedirs(dir_path, exist_ok=True)
+        _atomic_write(path, data)
     
     return None
 
 
+def _atomic_write(path: str, data: bytes) -> None:
+    path = os.path.realpath(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix="." + os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)
+            else:
+                os.chmod(tmp_path, mode)
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def replace_file_lines(path: str, content: str, start: int, end: Optional[int] = None) -> Optional[str]:
     error, lines, total = read_file_lines(path, 1, None)
     if error:
@@ -82,9 +127,7 @@ def replace_file_lines(path: str, content: str, start: int, end: Optional[int] =
     else:
         lines[start-1:end] = new_lines
     
-    with open(path, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
-    
+    _atomic_write(path, "".join(lines).encode('utf-8'))
     return None
 
 
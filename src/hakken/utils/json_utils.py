@@ -1,21 +1,53 @@
 import json
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def is_valid_json_start(s: str) -> bool:
-    idx = 0
-    while idx < len(s):
-        if s[idx] in ' \t\n\r':
-            idx += 1
-            continue
-        return (
-            s[idx] in '{["' or 
-            s[idx:idx+4] in ('true', 'null') or 
-            s[idx:idx+5] == 'false' or 
-            s[idx].isdigit() or 
-            s[idx] == '-'
-        )
-    return False
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_ENCODER = json.JSONEncoder(default=str, ensure_ascii=False, separators=(",", ":"))
+_ASCII_ENCODER = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+def dumps(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return _ENCODER.encode(value)
+
+
+def dump_line(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            pass
+    return (_ENCODER.encode(value) + "\n").encode("utf-8")
+
+
+def dump_ascii(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+            if encoded.isascii():
+                return encoded
+        except TypeError:
+            pass
+    return _ASCII_ENCODER.encode(value).encode("ascii")
 
 
 def _try_parse_stringified_json(value: Any) -> Any:
@@ -23,7 +55,7 @@ def _try_parse_stringified_json(value: Any) -> Any:
         stripped = value.strip()
         if stripped.startswith(('[', '{')):
             try:
-                parsed = json.loads(stripped)
+                parsed = loads(stripped)
                 return _try_parse_stringified_json(parsed)
             except json.JSONDecodeError:
                 return value
@@ -39,14 +71,11 @@ def parse_tool_arguments(raw_args: str) -> Tuple[dict, Optional[str]]:
     if not raw_args:
         return {}, None
     
-    if not is_valid_json_start(raw_args):
-        return {}, f"Invalid JSON: {raw_args[:100]}"
-    
     try:
-        decoded = json.loads(raw_args)
-        if isinstance(decoded, dict):
-            decoded = _try_parse_stringified_json(decoded)
-            return decoded, None
-        return {}, "Expected JSON object"
+        decoded = loads(raw_args)
     except json.JSONDecodeError as e:
         return {}, f"Invalid JSON: {str(e)}"
+    
+    if isinstance(decoded, dict):
+        return _try_parse_stringified_json(decoded), None
+    return {}, "Expected JSON object"
@@ -0,0 +1,25 @@
+from functools import lru_cache
+from importlib.util import find_spec
+
+from hakken.utils.env import env_bool
+
+TOKENIZER_ENCODING = "cl100k_base"
+TIKTOKEN_AVAILABLE = find_spec("tiktoken") is not None
+
+
+@lru_cache(maxsize=1)
+def get_encoder():
+    if not TIKTOKEN_AVAILABLE or not env_bool("HAKKEN_TIKTOKEN", True):
+        return None
+    import tiktoken
+    try:
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoder = get_encoder()
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
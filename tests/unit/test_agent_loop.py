@@ -0,0 +1,319 @@
+import asyncio
+import pytest  # type: ignore
+from types import SimpleNamespace
+from hakken.core.agent import Agent
+from hakken.history.manager import HistoryManager
+from hakken.history.tracer import TraceLogger
+from hakken.prompts.manager import PromptManager
+from hakken.subagents.manager import SubagentManager
+
+
+class DummyUI:
+    def __init__(self):
+        self.chunks = []
+
+    def print_simple_message(self, message, prefix=""):
+        pass
+
+    def print_info(self, message):
+        pass
+
+    def print_assistant_message(self, message):
+        pass
+
+    def start_stream_display(self):
+        pass
+
+    def print_streaming_content(self, chunk):
+        self.chunks.append(chunk)
+
+    def stop_stream_display(self):
+        pass
+
+    def show_preparing_tool(self, tool_name, args):
+        pass
+
+    def show_tool_execution(self, tool_name, args, success, result):
+        pass
+
+
+class DummyToolManager:
+    def __init__(self):
+        self.calls = []
+        self.description_calls = 0
+
+    def get_tools_description(self):
+        self.description_calls += 1
+        return []
+
+    def get_tool(self, tool_name):
+        return object() if tool_name == "todo_write" else None
+
+    def get_tool_status(self, tool_name):
+        return ""
+
+    async def run_tool(self, tool_name, **kwargs):
+        self.calls.append((tool_name, kwargs))
+        return f"ran {tool_name}"
+
+
+def make_tool_call(call_id, name, arguments="{}"):
+    return SimpleNamespace(
+        id=call_id,
+        type="function",
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def make_response(content="", tool_calls=None):
+    return SimpleNamespace(role="assistant", content=content, tool_calls=tool_calls, usage=None)
+
+
+class ScriptedAPIClient:
+    total_cost = 0
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.requests = []
+
+    async def get_completion_stream_async(self, request):
+        self.requests.append(request)
+        response = self._responses.pop(0)
+        if response.content:
+            yield response.content
+        yield response
+
+
+class CountingHistoryManager(HistoryManager):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compression_checks = 0
+
+    def auto_messages_compression(self):
+        self.compression_checks += 1
+        super().auto_messages_compression()
+
+
+def make_agent(responses, tool_manager=None):
+    ui = DummyUI()
+    history = CountingHistoryManager(ui_manager=ui, trace_logger=TraceLogger(enabled=False))
+    api_client = ScriptedAPIClient(responses)
+    agent = Agent(
+        tool_manager=tool_manager or DummyToolManager(),
+        api_client=api_client,
+        ui_manager=ui,
+        history_manager=history,
+        prompt_manager=PromptManager(),
+        subagent_manager=SubagentManager(),
+        is_bridge_mode=True,
+    )
+    agent.add_message({"role": "user", "content": [{"type": "text", "text": "hello"}]})
+    return agent, ui, history, api_client
+
+
+@pytest.mark.asyncio
+async def test_agent_streams_and_records_assistant_message():
+    agent, ui, history, _ = make_agent([make_response("hi there")])
+
+    await agent._recursive_message_handling()
+
+    assert "".join(ui.chunks) == "hi there"
+    assert agent.messages[-1]["role"] == "assistant"
+    assert agent.messages[-1]["content"] == "hi there"
+
+
+@pytest.mark.asyncio
+async def test_agent_checks_compression_once_per_turn():
+    agent, _, history, _ = make_agent([make_response("done")])
+
+    await agent._recursive_message_handling()
+
+    assert history.compression_checks == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_runs_tool_calls_then_continues():
+    tools = DummyToolManager()
+    responses = [
+        make_response(tool_calls=[make_tool_call("call_1", "read_file", '{"file_path": "/tmp/x"}')]),
+        make_response("finished"),
+    ]
+    agent, _, _, api_client = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert tools.calls == [("read_file", {"file_path": "/tmp/x"})]
+    assert len(api_client.requests) == 2
+    roles = [m["role"] for m in agent.messages]
+    assert roles == ["user", "assistant", "tool", "assistant"]
+
+
+@pytest.mark.asyncio
+async def test_task_system_message_shares_cached_prefix():
+    agent, _, history, api_client = make_agent([make_response("task done")])
+    agent._system_prompt = "shared rules"
+
+    result = await agent.start_task("review the diff", "check main.py")
+
+    system_blocks = api_client.requests[0]["messages"][0]["content"]
+    assert system_blocks[0] == {"type": "text", "text": "shared rules", "cache_control": {"type": "ephemeral"}}
+    assert system_blocks[1] == {"type": "text", "text": "review the diff", "cache_control": {"type": "ephemeral"}}
+    assert result == "task done"
+
+
+class ConcurrentToolManager(DummyToolManager):
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.max_running = 0
+
+    async def run_tool(self, tool_name, **kwargs):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if tool_name == "list_dir":
+            raise RuntimeError("boom")
+        return await super().run_tool(tool_name, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_and_keep_order():
+    tools = ConcurrentToolManager()
+    responses = [
+        make_response(tool_calls=[
+            make_tool_call("call_1", "read_file"),
+            make_tool_call("call_2", "list_dir"),
+            make_tool_call("call_3", "grep_search"),
+        ]),
+        make_response("finished"),
+    ]
+    agent, _, _, _ = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert tools.max_running == 3
+    tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == ["call_1", "call_2", "call_3"]
+    assert "boom" in tool_messages[1]["content"][0]["text"]
+    assert [len(m["content"]) for m in tool_messages] == [1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_that_may_write_run_in_order():
+    tools = ConcurrentToolManager()
+    responses = [
+        make_response(tool_calls=[
+            make_tool_call("call_1", "read_file"),
+            make_tool_call("call_2", "cmd_runner", '{"command": "npm install"}'),
+            make_tool_call("call_3", "cmd_runner", '{"command": "npm test"}'),
+            make_tool_call("call_4", "git_status"),
+            make_tool_call("call_5", "git_diff"),
+        ]),
+        make_response("finished"),
+    ]
+    agent, _, _, _ = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert [call[0] for call in tools.calls] == ["read_file", "cmd_runner", "cmd_runner", "git_status", "git_diff"]
+    assert [call[1].get("command") for call in tools.calls[1:3]] == ["npm install", "npm test"]
+    assert tools.max_running == 2
+
+
+class SlowToolManager(DummyToolManager):
+    async def run_tool(self, tool_name, **kwargs):
+        if tool_name == "slow":
+            await asyncio.Event().wait()
+        return await super().run_tool(tool_name, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_tool_calls_still_get_responses():
+    responses = [make_response(tool_calls=[make_tool_call("call_1", "read_file"), make_tool_call("call_2", "slow")])]
+    agent, _, _, _ = make_agent(responses, tool_manager=SlowToolManager())
+
+    task = asyncio.create_task(agent._recursive_message_handling())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [m["role"] for m in agent.messages] == ["user", "assistant", "tool", "tool"]
+    first, second = agent.messages[2:]
+    assert (first["tool_call_id"], second["tool_call_id"]) == ("call_1", "call_2")
+    assert "ran read_file" in first["content"][0]["text"]
+    assert "cancelled by the user" in second["content"][0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_agent_asks_tool_manager_for_tools_each_request():
+    tools = DummyToolManager()
+    responses = [
+        make_response(tool_calls=[make_tool_call("call_1", "read_file")]),
+        make_response("finished"),
+    ]
+    agent, _, _, api_client = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert tools.description_calls == len(api_client.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_response_skips_reminder_without_todo_tool():
+    tools = DummyToolManager()
+    tools.get_tool = lambda tool_name: None
+    responses = [
+        make_response(tool_calls=[make_tool_call("call_1", "read_file")]),
+        make_response("finished"),
+    ]
+    agent, _, _, _ = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    tool_message = next(m for m in agent.messages if m["role"] == "tool")
+    assert len(tool_message["content"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_handles_long_tool_chains_without_recursion():
+    tools = DummyToolManager()
+    turns = 1500
+    responses = [
+        make_response(tool_calls=[make_tool_call(f"call_{i}", "read_file")]) for i in range(turns)
+    ] + [make_response("finished")]
+    agent, _, _, _ = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert len(tools.calls) == turns
+
+
+@pytest.mark.asyncio
+async def test_warm_caches_prefetches_tools_description():
+    from hakken.tools.manager import ToolManager
+
+    tools = ToolManager()
+    agent, _, _, api_client = make_agent([make_response("done")], tool_manager=tools)
+
+    await asyncio.get_running_loop().run_in_executor(None, agent.warm_caches)
+    warmed = tools._tools_description
+    await agent._recursive_message_handling()
+
+    assert warmed is not None
+    assert api_client.requests[0]["tools"] is warmed
+
+
+@pytest.mark.asyncio
+async def test_need_user_approve_flag_is_not_passed_to_tool():
+    tools = DummyToolManager()
+    responses = [
+        make_response(tool_calls=[make_tool_call("call_1", "read_file", '{"file_path": "/tmp/x", "need_user_approve": false}')]),
+        make_response("finished"),
+    ]
+    agent, _, _, _ = make_agent(responses, tool_manager=tools)
+
+    await agent._recursive_message_handling()
+
+    assert tools.calls == [("read_file", {"file_path": "/tmp/x"})]
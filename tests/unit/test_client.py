@@ -0,0 +1,142 @@
+import pytest  # type: ignore
+from hakken.core.client import APIClient
+from hakken.core.config import APIClientConfig
+
+
+def make_config(**kwargs):
+    return APIClientConfig(api_key="test", base_url="http://localhost:9", model="test-model", **kwargs)
+
+
+def test_api_clients_share_http_pool():
+    first = APIClient(make_config())
+    second = APIClient(make_config(timeout=5.0))
+
+    assert first.client._client is second.client._client
+    assert second.client.timeout == 5.0
+
+
+def make_chunk(content=None, tool_calls=None, usage=None):
+    from types import SimpleNamespace
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=usage)
+
+
+def make_tool_delta(index, call_id=None, name=None, arguments=None):
+    from types import SimpleNamespace
+    return SimpleNamespace(
+        index=index,
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def stream_with(chunks):
+    client = APIClient(make_config())
+    client.client.chat.completions.create = lambda **kwargs: iter(chunks)
+    return list(client._stream_completion({"messages": []}))
+
+
+def test_stream_completion_yields_text_then_message():
+    items = stream_with([make_chunk("Hel"), make_chunk("lo")])
+
+    assert items[:2] == ["Hel", "lo"]
+    assert items[-1].content == "Hello"
+    assert items[-1].tool_calls is None
+
+
+def test_stream_completion_assembles_tool_call_arguments():
+    items = stream_with([
+        make_chunk(tool_calls=[make_tool_delta(0, "call_1", "read_file", '{"file_')]),
+        make_chunk(tool_calls=[make_tool_delta(0, arguments='path": "/a"}')]),
+        make_chunk(tool_calls=[make_tool_delta(1, "call_2", "list_dir", "{}")]),
+    ])
+
+    tool_calls = items[-1].tool_calls
+    assert [tc.id for tc in tool_calls] == ["call_1", "call_2"]
+    assert tool_calls[0].function.name == "read_file"
+    assert tool_calls[0].function.arguments == '{"file_path": "/a"}'
+    assert tool_calls[1].function.arguments == "{}"
+
+
+def async_stream_with(client, attempts):
+    async def create(**kwargs):
+        outcome = attempts.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        async def chunks():
+            for chunk in outcome:
+                yield chunk
+
+        return chunks()
+
+    client.async_client.chat.completions.create = create
+
+
+@pytest.mark.asyncio
+async def test_async_stream_retries_without_blocking():
+    client = APIClient(make_config(base_delay=0.0))
+    async_stream_with(client, [ConnectionError("connection reset"), [make_chunk("Hi")]])
+
+    items = [item async for item in client.get_completion_stream_async({"messages": []})]
+
+    assert items[0] == "Hi"
+    assert items[-1].content == "Hi"
+
+
+@pytest.mark.asyncio
+async def test_async_stream_raises_non_retryable_errors():
+    client = APIClient(make_config(base_delay=0.0))
+    async_stream_with(client, [ValueError("bad request")])
+
+    with pytest.raises(Exception, match="bad request"):
+        [item async for item in client.get_completion_stream_async({"messages": []})]
+
+
+@pytest.mark.asyncio
+async def test_shared_async_pool_keeps_connections_alive_and_closes():
+    from hakken.core import client as client_module
+
+    first = APIClient(make_config())
+    second = APIClient(make_config())
+    assert first.async_client._client is second.async_client._client
+
+    await client_module.close_shared_http_clients()
+    assert client_module._shared_async_http_client is None
+    assert client_module._shared_http_client is None
+
+
+def test_stream_completion_skips_chunks_without_choices():
+    from types import SimpleNamespace
+
+    items = stream_with([make_chunk("a"), SimpleNamespace(choices=[], usage=None), make_chunk("b")])
+
+    assert items[-1].content == "ab"
+
+
+def test_reduce_tool_call_delta_grows_and_appends():
+    from hakken.core.client import reduce_tool_call_delta
+
+    ids, names, arg_parts = [], [], []
+    reduce_tool_call_delta(1, "call_2", "list_dir", "{", ids, names, arg_parts)
+    reduce_tool_call_delta(1, None, None, "}", ids, names, arg_parts)
+
+    assert ids == [None, "call_2"]
+    assert names == [None, "list_dir"]
+    assert arg_parts == [[], ["{", "}"]]
+
+
+@pytest.mark.parametrize("field, value", [("timeout", 0.0), ("max_retries", -1), ("max_delay", -1.0)])
+def test_config_rejects_invalid_limits(field, value):
+    with pytest.raises(ValueError):
+        make_config(**{field: value})
+
+
+def test_requests_carry_the_prompt_cache_key():
+    client = APIClient(make_config(prompt_cache_key="session"))
+    request = {"messages": [], "extra_body": {"top_k": 1}}
+
+    client._prepare_stream_request(request)
+
+    assert "prompt_cache_key" not in request
+    assert request["extra_body"] == {"top_k": 1, "prompt_cache_key": "session"}
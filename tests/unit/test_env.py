@@ -0,0 +1,38 @@
+from hakken.utils.env import env_bool, env_float, env_int
+
+
+def test_env_bool_parses_common_spellings(monkeypatch):
+    monkeypatch.setenv("HAKKEN_FLAG", " Yes ")
+    assert env_bool("HAKKEN_FLAG", False) is True
+
+    monkeypatch.setenv("HAKKEN_FLAG", "false")
+    assert env_bool("HAKKEN_FLAG", True) is False
+
+    monkeypatch.delenv("HAKKEN_FLAG")
+    assert env_bool("HAKKEN_FLAG", True) is True
+
+
+def test_env_numbers_fall_back_on_malformed_values(monkeypatch):
+    monkeypatch.setenv("HAKKEN_INT", "abc")
+    monkeypatch.setenv("HAKKEN_FLOAT", "0.5x")
+    assert env_int("HAKKEN_INT", 200) == 200
+    assert env_float("HAKKEN_FLOAT", 0.8) == 0.8
+
+    monkeypatch.setenv("HAKKEN_INT", " 128 ")
+    monkeypatch.setenv("HAKKEN_FLOAT", "0.5")
+    assert env_int("HAKKEN_INT", 200) == 128
+    assert env_float("HAKKEN_FLOAT", 0.8) == 0.5
+
+
+
+def test_load_env_file_reads_dotenv_once(monkeypatch):
+    import dotenv
+    from hakken.utils import env
+
+    calls = []
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda: calls.append(True))
+    monkeypatch.setattr(env, "_env_file_loaded", False)
+
+    env.load_env_file()
+    env.load_env_file()
+    assert calls == [True]
@@ -0,0 +1,41 @@
+from hakken.core.factory import AgentFactory
+
+
+def test_prompt_manager_is_shared():
+    assert AgentFactory.create_prompt_manager() is AgentFactory.create_prompt_manager()
+
+
+def test_default_api_client_config_is_read_once(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:9")
+    monkeypatch.setenv("OPENAI_MODEL", "test-model")
+    from hakken.core import factory
+    factory._default_api_client_config.cache_clear()
+
+    first = AgentFactory.create_api_client()
+    second = AgentFactory.create_api_client()
+
+    assert first is not second
+    assert first.config is second.config
+    factory._default_api_client_config.cache_clear()
+
+
+def test_agent_leaves_prompt_cache_key_unset_by_default():
+    from hakken.core.client import APIClient
+    from hakken.core.config import APIClientConfig
+    from hakken.history.manager import HistoryManager
+    from hakken.history.tracer import TraceLogger
+
+    api_client = APIClient(APIClientConfig(api_key="test", base_url="http://localhost:9", model="test-model"))
+    history_manager = HistoryManager(ui_manager=object(), trace_logger=TraceLogger(enabled=False))
+
+    AgentFactory.create_agent(
+        api_client=api_client,
+        ui_manager=object(),
+        history_manager=history_manager,
+    )
+    request = {"messages": []}
+    api_client._prepare_stream_request(request)
+
+    assert api_client.prompt_cache_key is None
+    assert "extra_body" not in request
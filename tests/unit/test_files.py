@@ -0,0 +1,77 @@
+import errno
+import os
+import pytest  # type: ignore
+from hakken.utils.files import write_file_content, replace_file_lines
+
+
+def test_write_file_content_creates_parent_dirs(tmp_path):
+    target = tmp_path / "nested" / "dir" / "file.txt"
+
+    error = write_file_content(str(target), "héllo")
+
+    assert error is None
+    assert target.read_text(encoding="utf-8") == "héllo"
+    assert os.listdir(target.parent) == ["file.txt"]
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(target).st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_write_file_content_recreates_removed_dir(tmp_path):
+    target = tmp_path / "gone" / "file.txt"
+    write_file_content(str(target), "first")
+    target.unlink()
+    target.parent.rmdir()
+
+    error = write_file_content(str(target), "second")
+
+    assert error is None
+    assert target.read_text() == "second"
+
+
+def test_write_file_content_preserves_mode(tmp_path):
+    target = tmp_path / "script.sh"
+    target.write_text("echo old\n")
+    os.chmod(target, 0o755)
+
+    write_file_content(str(target), "echo new\n", create_dirs=False)
+
+    assert target.read_text() == "echo new\n"
+    assert os.stat(target).st_mode & 0o777 == 0o755
+
+
+def test_write_file_content_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    target = tmp_path / "full.txt"
+    target.write_text("old")
+
+    def no_space(fd, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "write", no_space)
+    with pytest.raises(OSError):
+        write_file_content(str(target), "new", create_dirs=False)
+
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["full.txt"]
+
+
+def test_write_file_content_keeps_existing_tmp_file(tmp_path):
+    target = tmp_path / "config.json"
+    user_file = tmp_path / "config.json.tmp"
+    user_file.write_text("mine")
+
+    assert write_file_content(str(target), "{}") is None
+
+    assert target.read_text() == "{}"
+    assert user_file.read_text() == "mine"
+    assert sorted(os.listdir(tmp_path)) == ["config.json", "config.json.tmp"]
+
+
+def test_replace_file_lines(tmp_path):
+    target = tmp_path / "lines.txt"
+    target.write_text("a\nb\nc\n")
+
+    error = replace_file_lines(str(target), "B", 2, 2)
+
+    assert error is None
+    assert target.read_text() == "a\nB\nc\n"
@@ -0,0 +1,62 @@
+import pytest  # type: ignore
+from hakken.tools.filesystem.search_replace import SearchReplaceTool
+
+
+@pytest.mark.asyncio
+async def test_search_replace_replaces_all_occurrences(tmp_path):
+    target = tmp_path / "sample.py"
+    target.write_text("foo = 1\nfoo += foo\n")
+    tool = SearchReplaceTool()
+
+    result = await tool.act(str(target), "foo", "bar")
+
+    assert "3 occurrence(s)" in result
+    assert target.read_text() == "bar = 1\nbar += bar\n"
+
+
+@pytest.mark.asyncio
+async def test_search_replace_reports_actual_count_when_limited(tmp_path):
+    target = tmp_path / "sample.py"
+    target.write_text("foo foo")
+    tool = SearchReplaceTool()
+
+    result = await tool.act(str(target), "foo", "bar", count=5)
+
+    assert "2 occurrence(s)" in result
+    assert target.read_text() == "bar bar"
+
+
+@pytest.mark.asyncio
+async def test_search_replace_missing_string(tmp_path):
+    target = tmp_path / "sample.py"
+    target.write_text("foo")
+    tool = SearchReplaceTool()
+
+    result = await tool.act(str(target), "baz", "bar")
+
+    assert result.startswith("Error")
+    assert target.read_text() == "foo"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, -1, "many"])
+async def test_search_replace_rejects_invalid_count(tmp_path, count):
+    target = tmp_path / "sample.py"
+    target.write_text("foo foo")
+    tool = SearchReplaceTool()
+
+    result = await tool.act(str(target), "foo", "bar", count=count)
+
+    assert result.startswith("Error: count must be a positive integer")
+    assert target.read_text() == "foo foo"
+
+
+@pytest.mark.asyncio
+async def test_search_replace_accepts_numeric_string_count(tmp_path):
+    target = tmp_path / "sample.py"
+    target.write_text("foo foo")
+
+    result = await SearchReplaceTool().act(str(target), "foo", "bar", count="1")
+
+    assert "1 occurrence(s)" in result
+    assert target.read_text() == "bar foo"
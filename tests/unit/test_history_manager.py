@@ -0,0 +1,386 @@
+import pytest  # type: ignore
+from hakken.core.state import TokenUsage
+from hakken.history.manager import HistoryManager, estimate_message_tokens
+from hakken.history.tracer import TraceLogger
+from hakken.utils import tokens
+
+
+@pytest.fixture(autouse=True)
+def char_token_heuristic(monkeypatch):
+    monkeypatch.setattr(tokens, "get_encoder", lambda: None)
+
+
+class DummyUI:
+    def __init__(self):
+        self.messages = []
+
+    def print_assistant_message(self, message):
+        self.messages.append(message)
+
+
+def make_history(**kwargs):
+    return HistoryManager(ui_manager=DummyUI(), trace_logger=TraceLogger(enabled=False), **kwargs)
+
+
+def test_estimate_message_tokens_counts_text_blocks():
+    message = {"role": "user", "content": [{"type": "text", "text": "a" * 40}]}
+    assert estimate_message_tokens(message) == 10
+
+
+def test_estimate_message_tokens_counts_tool_call_arguments():
+    message = {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{"id": "1", "function": {"name": "edit_file", "arguments": "x" * 80}}],
+    }
+    assert estimate_message_tokens(message) == 20
+
+
+def test_estimated_tokens_tracks_added_messages():
+    history = make_history()
+    history.add_message({"role": "system", "content": "s" * 400})
+    history.add_message({"role": "user", "content": "u" * 40})
+
+    assert history.estimated_tokens == 110
+
+
+def test_estimated_tokens_follow_task_chats():
+    history = make_history()
+    history.add_message({"role": "user", "content": "u" * 40})
+    history.start_new_chat()
+    history.add_message({"role": "user", "content": "t" * 400})
+    assert history.estimated_tokens == 100
+
+    history.add_message({"role": "assistant", "content": "done"})
+    history.finish_chat_get_response()
+    assert history.estimated_tokens == 10
+
+
+def test_requires_compression_from_local_estimate():
+    history = make_history(model_max_tokens=1, compress_threshold=0.5)
+    history.add_message({"role": "user", "content": "u" * 4096})
+
+    assert history._requires_compression()
+
+
+def test_requires_compression_from_reported_usage():
+    history = make_history(model_max_tokens=1, compress_threshold=0.5)
+    history.add_message({"role": "user", "content": "hi"})
+    history.history_token_usage.append(TokenUsage(total_tokens=1000))
+
+    assert history._requires_compression()
+
+
+def test_crop_recalculates_estimate():
+    history = make_history()
+    history.add_message({"role": "system", "content": "s" * 40})
+    history.add_message({"role": "user", "content": "u" * 40})
+    history.add_message({"role": "assistant", "content": "a" * 400})
+
+    assert history.crop_message("bottom", 1) == "Crop message successful"
+
+    assert history.estimated_tokens == 20
+
+
+def test_summary_keeps_user_text_and_clips_assistant_text():
+    history = make_history()
+    user_text = "u" * 1000
+    assistant_text = "a" * 2000
+
+    formatted = history._format_messages_for_summary([
+        {"role": "system", "content": "rules"},
+        {"role": "user", "content": [{"type": "text", "text": user_text}]},
+        {"role": "assistant", "content": assistant_text},
+    ])
+
+    user_line, assistant_line = formatted.split("\n")
+    assert user_line == "USER: " + "u" * 700 + "..."
+    assert assistant_line == "ASSISTANT: " + "a" * 400 + "..."
+
+
+def test_summary_references_repeated_code_blocks():
+    history = make_history()
+    code = "```python\nprint('hi')\n```"
+
+    formatted = history._format_messages_for_summary([
+        {"role": "user", "content": f"fix this {code}"},
+        {"role": "assistant", "content": f"here it is {code}"},
+    ])
+
+    assert formatted.count(code) == 1
+    assert "`[code:" in formatted
+
+
+def test_request_messages_match_apply_cache_control():
+    from hakken.core.message_builder import MessageBuilder
+
+    history = make_history()
+    history.add_message(MessageBuilder.create_system_message("rules", cache=True))
+    history.add_message(MessageBuilder.create_user_message("first"))
+    history.get_request_messages()
+    history.add_message({"role": "assistant", "content": "reply"})
+    assert "cache_control" not in history.get_request_messages()[1]["content"][-1]
+    history.add_message(MessageBuilder.create_user_message("second"))
+
+    request_messages = history.get_request_messages()
+    stripped = history.get_current_messages()
+    del stripped[-1]["content"][-1]["cache_control"]
+    assert request_messages == MessageBuilder.apply_cache_control(stripped)
+    assert history.messages_history[-1][2]["content"] == "reply"
+
+
+def test_request_messages_mark_system_and_tail():
+    history = make_history(cache_breakpoints=["post_system", "post_tail"])
+    history.add_message({"role": "system", "content": "rules"})
+    history.add_message({"role": "user", "content": [{"type": "text", "text": "hi"}]})
+    history.add_message({"role": "assistant", "content": "hello"})
+
+    messages = history.get_request_messages()
+
+    assert messages[0]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in messages[1]["content"][-1]
+    assert messages[2]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_request_messages_without_breakpoints():
+    history = make_history(cache_breakpoints=[])
+    history.add_message({"role": "system", "content": "rules"})
+    history.add_message({"role": "user", "content": [{"type": "text", "text": "hi"}]})
+
+    messages = history.get_request_messages()
+
+    assert messages[0]["content"] == "rules"
+    assert "cache_control" not in messages[1]["content"][-1]
+
+
+def test_current_messages_are_detached_from_history():
+    history = make_history()
+    history.add_message({"role": "user", "content": [{"type": "text", "text": "hi"}]})
+
+    messages = history.get_current_messages()
+    messages[0]["content"][0]["text"] = "changed"
+    messages[0]["content"][0]["meta"] = {"nested": True}
+    messages[0]["content"].append({"type": "text", "text": "extra"})
+    messages.append({"role": "assistant", "content": "x"})
+
+    assert history.get_current_messages() == [{"role": "user", "content": [{"type": "text", "text": "hi"}]}]
+
+
+def test_current_messages_copy_nested_tool_calls():
+    history = make_history()
+    tool_call = {"id": "1", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+    history.add_message({"role": "assistant", "content": None, "tool_calls": [tool_call]})
+
+    history.get_current_messages()[0]["tool_calls"][0]["function"]["arguments"] = "changed"
+
+    assert tool_call["function"]["arguments"] == "{}"
+
+
+def test_compression_keeps_system_messages_before_second_session():
+    history = make_history()
+    history._compress_with_llm_summary = lambda messages: f"{len(messages)} messages"
+    for message in [
+        {"role": "system", "content": "rules"},
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "ok"},
+        {"role": "system", "content": "notice"},
+        {"role": "user", "content": "second"},
+        {"role": "assistant", "content": "done"},
+    ]:
+        history.add_message(message)
+
+    history._compress_current_message()
+
+    assert [m["content"] for m in history.messages_history[-1]] == [
+        "rules", "notice", "[Previous Session Summary]\n4 messages", "second", "done",
+    ]
+
+
+def test_system_indices_follow_crop_and_task_chats():
+    history = make_history()
+    history.add_message({"role": "system", "content": "rules"})
+    history.add_message({"role": "user", "content": "first"})
+    history.add_message({"role": "assistant", "content": "ok"})
+    history.add_message({"role": "system", "content": "notice"})
+    history.add_message({"role": "user", "content": "second"})
+    assert history._system_indices[-1] == [0, 3]
+
+    history.start_new_chat()
+    history.add_message({"role": "user", "content": "task"})
+    assert history._system_indices == [[0, 3], []]
+    history.add_message({"role": "assistant", "content": "done"})
+    history.finish_chat_get_response()
+
+    assert history.crop_message("top", 2) == "Crop message successful"
+    assert [m["content"] for m in history.messages_history[-1]] == ["rules", "ok", "notice", "second"]
+    assert history._system_indices == [[0, 2]]
+    assert history._user_indices == [[3]]
+
+
+def test_clear_old_tool_results_only_clears_new_older_results():
+    history = make_history()
+    for i in range(4):
+        history.add_message({"role": "tool", "content": f"result {i}"})
+    assert history.clear_old_tool_results(keep_last_n=2) == 2
+
+    history.add_message({"role": "assistant", "content": "next"})
+    history.add_message({"role": "tool", "content": "result 4"})
+    assert history.clear_old_tool_results(keep_last_n=2) == 1
+    assert [m["content"] for m in history.messages_history[-1]] == [
+        "[Tool result cleared to save context]",
+        "[Tool result cleared to save context]",
+        "[Tool result cleared to save context]",
+        "result 3",
+        "next",
+        "result 4",
+    ]
+
+
+def test_role_indices_rebuilt_after_compression():
+    history = make_history()
+    history._compress_with_llm_summary = lambda messages: "summary"
+    for message in [
+        {"role": "system", "content": "rules"},
+        {"role": "user", "content": "first"},
+        {"role": "tool", "content": "old"},
+        {"role": "user", "content": "second"},
+        {"role": "tool", "content": "new"},
+    ]:
+        history.add_message(message)
+    assert history._user_indices[-1] == [1, 3]
+    assert history._tool_indices[-1] == [2, 4]
+
+    history._compress_current_message()
+
+    assert history._system_indices[-1] == [0]
+    assert history._user_indices[-1] == [1, 2]
+    assert history._tool_indices[-1] == [3]
+
+
+def test_auto_compression_summarizes_in_background():
+    import threading
+    from types import SimpleNamespace
+
+    release = threading.Event()
+
+    class SlowClient:
+        def get_completion(self, request_params):
+            release.wait(5)
+            return SimpleNamespace(content="summary"), None
+
+    history = make_history(api_client=SlowClient(), model_max_tokens=1, compress_threshold=0.001)
+    for message in [
+        {"role": "system", "content": "rules"},
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "ok"},
+        {"role": "user", "content": "second"},
+        {"role": "assistant", "content": "done"},
+    ]:
+        history.add_message(message)
+
+    history.auto_messages_compression()
+    assert len(history.messages_history[-1]) == 5
+
+    release.set()
+    history._pending_summary.future.result(5)
+    history.add_message({"role": "user", "content": "third"})
+
+    assert [m["content"] for m in history.messages_history[-1]] == [
+        "rules", "[Previous Session Summary]\nsummary", "second", "done", "third",
+    ]
+    assert history._user_indices[-1] == [1, 2, 4]
+
+
+def test_failed_background_summary_falls_back_on_next_user_message():
+    from concurrent.futures import Future
+    from hakken.history.manager import PendingSummary
+
+    history = make_history()
+    for message in [
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "ok"},
+        {"role": "user", "content": "second"},
+    ]:
+        history.add_message(message)
+    future = Future()
+    future.set_exception(RuntimeError("api down"))
+    history._pending_summary = PendingSummary(future, 0, history.messages_history[-1][2])
+
+    history.add_message({"role": "user", "content": "third"})
+
+    assert [m["content"] for m in history.messages_history[-1]] == [
+        "[Previous Session Summary]\n[Previous conversation compressed (LLM summarization failed)]",
+        "second",
+        "third",
+    ]
+    assert "api down" in history._ui_manager.messages[-1]
+
+
+def test_task_chat_compresses_while_parent_summary_is_pending():
+    from concurrent.futures import Future
+    from hakken.history.manager import PendingSummary
+
+    history = make_history(model_max_tokens=1, compress_threshold=0.5)
+    history.add_message({"role": "user", "content": "parent"})
+    parent_pending = PendingSummary(Future(), 0, history.messages_history[-1][0])
+    history._pending_summary = parent_pending
+
+    history.start_new_chat()
+    history.add_message({"role": "user", "content": "task"})
+    for i in range(5):
+        history.add_message({"role": "assistant", "content": "x" * 4096})
+
+    history.auto_messages_compression()
+
+    assert len(history.messages_history[-1]) == 4
+    assert history._pending_summary is parent_pending
+
+
+def test_add_message_stores_role_enum_as_plain_string():
+    from hakken.history.manager import Role
+
+    history = make_history()
+    history.add_message({"role": Role.USER, "content": "hi"})
+
+    stored = history.messages_history[-1][0]
+    assert type(stored["role"]) is str and stored["role"] == "user"
+    assert history._user_indices[-1] == [0]
+
+
+def test_crop_updates_history_and_role_indices_in_place():
+    history = make_history()
+    for message in [
+        {"role": "system", "content": "rules"},
+        {"role": "user", "content": "first"},
+        {"role": "tool", "content": "result"},
+        {"role": "user", "content": "second"},
+        {"role": "assistant", "content": "a"},
+        {"role": "tool", "content": "b"},
+    ]:
+        history.add_message(message)
+    messages = history.messages_history[-1]
+
+    assert history.crop_message("bottom", 2) == "Crop message successful"
+    assert history.crop_message("top", 2) == "Crop message successful"
+
+    assert history.messages_history[-1] is messages
+    assert [m["content"] for m in messages] == ["rules", "result", "second"]
+    assert history._system_indices[-1] == [0]
+    assert history._user_indices[-1] == [2]
+    assert history._tool_indices[-1] == [1]
+
+
+def test_current_context_window_follows_token_usage():
+    from types import SimpleNamespace
+
+    history = make_history(model_max_tokens=1)
+    assert history.current_context_window == "0.0"
+
+    history.update_token_usage(SimpleNamespace(prompt_tokens=500, completion_tokens=12, total_tokens=512))
+    assert history.current_context_window == "50.0"
+
+    history.start_new_chat()
+    assert history.current_context_window == "0.0"
+    history.add_message({"role": "assistant", "content": "done"})
+    history.finish_chat_get_response()
+    assert history.current_context_window == "50.0"
@@ -1,4 +1,5 @@
-from hakken.utils.json_utils import parse_tool_arguments, _try_parse_stringified_json
+import json
+from hakken.utils.json_utils import dumps, parse_tool_arguments, _try_parse_stringified_json
 
 
 def test_parse_normal_json():
@@ -78,3 +79,43 @@ def test_try_parse_leaves_normal_strings():
 def test_try_parse_invalid_json_string():
     result = _try_parse_stringified_json("[not valid json")
     assert result == "[not valid json"
+
+
+def test_parse_truncated_json():
+    result, error = parse_tool_arguments('{"name": "te')
+
+    assert result == {}
+    assert "Invalid JSON" in error
+
+
+def test_dumps_round_trips_unicode_and_int_keys():
+    value = {"result": "héllo", 1: [True, None]}
+
+    assert json.loads(dumps(value)) == {"result": "héllo", "1": [True, None]}
+
+
+def test_dumps_falls_back_for_big_ints():
+    assert json.loads(dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+
+def test_dumps_stringifies_unknown_objects():
+    from pathlib import Path
+
+    assert json.loads(dumps({"path": Path("/tmp/x")})) == {"path": "/tmp/x"}
+
+
+def test_dumps_fallback_matches_compact_output():
+    assert dumps({"n": 2 ** 70, "s": "é"}) == '{"n":%d,"s":"é"}' % 2 ** 70
+
+
+def test_dump_line_appends_newline():
+    from hakken.utils.json_utils import dump_line
+
+    assert dump_line({"s": "é", 1: 2 ** 70}) == ('{"s":"é","1":%d}\n' % 2 ** 70).encode()
+
+
+def test_dump_ascii_escapes_non_ascii_text():
+    from hakken.utils.json_utils import dump_ascii
+
+    assert dump_ascii({"a": [1, "x"]}) == b'{"a":[1,"x"]}'
+    assert dump_ascii({"a": "é"}) == b'{"a":"\\u00e9"}'
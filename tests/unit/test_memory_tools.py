@@ -0,0 +1,28 @@
+import json
+
+import pytest  # type: ignore
+from hakken.tools.memory.recall import RecallMemoryTool
+
+
+@pytest.mark.asyncio
+async def test_recall_memory_returns_best_matches_first(tmp_path):
+    memory_file = tmp_path / "memories.json"
+    memory_file.write_text(json.dumps([
+        "Tests run with pytest",
+        "The bridge talks to the React UI over stdout",
+        "Run pytest from the repo root with PYTHONPATH=src",
+    ]))
+    tool = RecallMemoryTool(memory_file=str(memory_file))
+
+    result = await tool.act("pytest root", limit=1)
+
+    assert "3. Run pytest from the repo root" in result
+    assert "Showing 1 of 2 matching entries" in result
+    assert "bridge" not in result
+
+
+@pytest.mark.asyncio
+async def test_recall_memory_without_entries(tmp_path):
+    tool = RecallMemoryTool(memory_file=str(tmp_path / "missing.json"))
+
+    assert (await tool.act("anything")).startswith("No knowledge entries found")
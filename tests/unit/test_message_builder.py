@@ -0,0 +1,37 @@
+from hakken.core.message_builder import MessageBuilder, text_block
+
+
+def test_create_user_message():
+    assert MessageBuilder.create_user_message("hi") == {
+        "role": "user",
+        "content": [{"type": "text", "text": "hi"}],
+    }
+
+
+def test_create_system_message_with_cache():
+    message = MessageBuilder.create_system_message("rules", cache=True)
+
+    assert message["content"] == [text_block("rules", cache=True)]
+    assert message["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_apply_cache_control_wraps_string_content():
+    messages = [{"role": "tool", "content": "result"}]
+
+    MessageBuilder.apply_cache_control(messages)
+
+    assert messages[0]["content"] == [
+        {"type": "text", "text": "result", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_assistant_message_flattens_sdk_tool_calls():
+    from openai.types.chat import ChatCompletionMessageToolCall
+
+    tool_call = ChatCompletionMessageToolCall(
+        id="call_1", type="function", function={"name": "read_file", "arguments": "{}"}
+    )
+
+    message = MessageBuilder.create_assistant_message(tool_calls=[tool_call])
+
+    assert message["tool_calls"] == [tool_call.model_dump(exclude_none=True)]
@@ -0,0 +1,38 @@
+from hakken.prompts.manager import PromptManager
+
+
+def test_system_prompt_is_fixed_for_the_agent_session(tmp_path, monkeypatch):
+    from hakken.core.agent import Agent
+
+    monkeypatch.chdir(tmp_path)
+    instructions = tmp_path / "Hakken.md"
+    instructions.write_text("use tabs")
+    agent = Agent(
+        tool_manager=None,
+        api_client=None,
+        ui_manager=None,
+        history_manager=None,
+        prompt_manager=PromptManager(),
+        subagent_manager=None,
+    )
+    assert agent.system_prompt.endswith("use tabs")
+
+    instructions.write_text("use spaces")
+
+    assert agent.system_prompt.endswith("use tabs")
+    assert PromptManager().get_system_prompt().endswith("use spaces")
+
+
+def test_check_git_repository_is_cached_per_directory(tmp_path, monkeypatch):
+    from hakken.prompts.environment import _check_git_repository, check_git_repository
+
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    monkeypatch.chdir(repo)
+    assert check_git_repository() == f"Is directory a git repo: Yes, In {repo} git repository"
+
+    (repo / ".git").rmdir()
+    assert "Yes" in check_git_repository()
+
+    _check_git_repository.cache_clear()
+    assert f"In {repo} git" not in check_git_repository()
@@ -0,0 +1,69 @@
+import pytest  # type: ignore
+from hakken.core.response_handler import ResponseHandler, StreamCoalescer
+
+
+class RecordingUI:
+    def __init__(self):
+        self.events = []
+
+    def start_stream_display(self):
+        self.events.append("start")
+
+    def print_streaming_content(self, chunk):
+        self.events.append(chunk)
+
+    def stop_stream_display(self):
+        self.events.append("stop")
+
+
+def test_coalescer_flushes_when_buffer_is_full():
+    writes = []
+    coalescer = StreamCoalescer(writes.append, flush_interval=60, max_buffer=4)
+
+    for chunk in "abcdefghij":
+        coalescer.push(chunk)
+    coalescer.flush()
+
+    assert writes == ["abcd", "efgh", "ij"]
+
+
+async def stream_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_process_stream_flushes_before_stopping_display():
+    ui = RecordingUI()
+    handler = ResponseHandler(ui)
+
+    message, content, usage = await handler.process_stream(stream_of("hel", "lo"))
+
+    assert content == "hello"
+    assert message.content == "hello"
+    assert ui.events[0] == "start"
+    assert ui.events[-1] == "stop"
+    assert "".join(ui.events[1:-1]) == "hello"
+
+
+def test_get_trimmed_content_joins_text_blocks():
+    content = [
+        {"type": "text", "text": " first"},
+        {"type": "image", "url": "x"},
+        {"type": "text", "text": None},
+        {"type": "text", "text": "second "},
+    ]
+
+    assert ResponseHandler.get_trimmed_content(content) == "first second"
+
+
+@pytest.mark.asyncio
+async def test_process_stream_falls_back_to_stub_message():
+    handler = ResponseHandler(RecordingUI())
+
+    message, _, usage = await handler.process_stream(stream_of("partial"))
+
+    assert message.role == "assistant"
+    assert message.tool_calls is None
+    assert usage is None
+    assert not hasattr(message, "__dict__")
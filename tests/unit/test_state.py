@@ -0,0 +1,47 @@
+import dataclasses
+import pytest  # type: ignore
+from hakken.core.state import AgentState, TokenUsage, Todo
+
+
+def test_with_mode_returns_new_state_sharing_messages():
+    state = AgentState(messages=[{"role": "user", "content": "hi"}])
+
+    running = state.with_mode("running")
+
+    assert running.mode == "running"
+    assert state.mode == "idle"
+    assert running.messages is state.messages
+    assert running.messages == [{"role": "user", "content": "hi"}]
+
+
+def test_state_is_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        AgentState().mode = "running"
+
+
+def test_state_round_trips_through_dict():
+    state = AgentState(
+        token_usage=TokenUsage(1, 2, 3),
+        todos=[Todo(id="1", content="write tests")],
+    ).with_message({"role": "user", "content": "hi"})
+
+    assert AgentState.from_dict(state.to_dict()) == state
+
+
+def test_with_message_shares_storage_and_keeps_snapshots():
+    base = AgentState().with_message({"n": 1})
+    first = base.with_message({"n": 2})
+    branch = base.with_message({"n": 3})
+
+    assert list(base.messages) == [{"n": 1}]
+    assert list(first.messages) == [{"n": 1}, {"n": 2}]
+    assert list(branch.messages) == [{"n": 1}, {"n": 3}]
+    assert first.messages[-1] == {"n": 2}
+    assert base.to_dict()["messages"] == [{"n": 1}]
+
+
+def test_history_reexports_the_core_token_usage():
+    import hakken.history
+    from hakken.core.state import TokenUsage
+
+    assert hakken.history.TokenUsage is TokenUsage
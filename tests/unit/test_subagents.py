@@ -0,0 +1,24 @@
+import pytest  # type: ignore
+from hakken.subagents.manager import SubagentManager
+
+
+def test_registered_prompts_stay_on_their_manager():
+    first = SubagentManager()
+    second = SubagentManager()
+
+    first.register_subagent_prompt("docs", "write docs")
+
+    assert first.get_subagent_prompt("docs").startswith("write docs\n\n")
+    assert first.get_subagent_prompt("refactor") == second.get_subagent_prompt("refactor")
+    with pytest.raises(ValueError):
+        second.get_subagent_prompt("docs")
+
+
+def test_prompts_carry_the_memory_reuse_guideline():
+    from hakken.subagents.manager import MEMORY_REUSE_GUIDELINE
+
+    manager = SubagentManager()
+    manager.register_subagent_prompt("raw", "as is", append_memory_guard=False)
+
+    assert manager.get_subagent_prompt("general-purpose").endswith(MEMORY_REUSE_GUIDELINE + "\n")
+    assert manager.get_subagent_prompt("raw") == "as is"
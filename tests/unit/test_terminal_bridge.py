@@ -0,0 +1,177 @@
+import asyncio
+
+from hakken.terminal_bridge import Bridge
+
+
+def test_emit_writes_each_frame_without_a_writer(capsys):
+    bridge = Bridge()
+    bridge.emit("stream_chunk", {"content": "Hel"})
+    assert capsys.readouterr().out == '__MSG__{"type":"stream_chunk","data":{"content":"Hel"}}__END__\n'
+
+    bridge.emit("stream_end")
+    assert capsys.readouterr().out == '__MSG__{"type":"stream_end","data":{}}__END__\n'
+
+
+def test_emit_escapes_non_ascii_content(capsys):
+    Bridge().emit("message", {"content": "h\u00e9llo \u2028"})
+
+    assert capsys.readouterr().out == '__MSG__{"type":"message","data":{"content":"h\\u00e9llo \\u2028"}}__END__\n'
+
+
+def test_read_stdin_processes_lines_from_a_pipe(monkeypatch):
+    import os
+
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b'{"type": "stop_agent"}\r\n\n \r\nnot json\n{"type": "user_input"}\n')
+    os.close(write_fd)
+    monkeypatch.setattr("sys.stdin", os.fdopen(read_fd))
+
+    bridge = Bridge()
+    processed, emitted = [], []
+    bridge.emit = lambda msg_type, data=None: emitted.append(msg_type)
+
+    async def process(msg):
+        processed.append(msg["type"])
+
+    bridge.process = process
+    asyncio.run(bridge.read_stdin())
+
+    assert processed == ["stop_agent", "user_input"]
+    assert emitted == ["error"]
+
+
+def test_user_input_runs_in_background_and_queues():
+    async def run():
+        bridge = Bridge()
+        bridge.emit = lambda msg_type, data=None: None
+        started, release = [], asyncio.Event()
+
+        async def handle_input(message):
+            started.append(message)
+            await release.wait()
+
+        bridge.handle_input = handle_input
+        await bridge.process({"type": "user_input", "data": {"message": "first"}})
+        await bridge.process({"type": "user_input", "data": {"message": "second"}})
+        await asyncio.sleep(0)
+        assert started == ["first"]
+
+        release.set()
+        await asyncio.gather(*bridge._pending)
+        assert started == ["first", "second"]
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_running_and_queued_input():
+    async def run():
+        bridge = Bridge()
+        emitted = []
+        bridge.emit = lambda msg_type, data=None: emitted.append(msg_type)
+        started = []
+
+        async def handle_input(message):
+            started.append(message)
+            await asyncio.Event().wait()
+
+        bridge.handle_input = handle_input
+        await bridge.process({"type": "user_input", "data": {"message": "first"}})
+        await bridge.process({"type": "user_input", "data": {"message": "second"}})
+        await asyncio.sleep(0)
+
+        await bridge.process({"type": "stop_agent"})
+
+        assert started == ["first"]
+        assert not bridge._pending and bridge.task is None
+        assert emitted[-1] == "stopped"
+
+    asyncio.run(run())
+
+
+def test_display_todos_prints_one_block(capsys):
+    from hakken.terminal_bridge import UIManager
+
+    UIManager().display_todos([
+        {"id": "1", "content": "plan", "status": "completed"},
+        {"id": "2", "content": "build", "status": "unknown"},
+    ])
+
+    assert capsys.readouterr().out == "\n📋 Todo List:\n  ✅ [1] plan\n  ⬜ [2] build\n\n"
+
+
+def test_writer_task_writes_in_order_off_the_event_loop(capsys):
+    async def run():
+        bridge = Bridge()
+        bridge._start_writer()
+        bridge.emit("stream_chunk", {"content": "a"})
+        bridge.emit("stream_end")
+        assert capsys.readouterr().out == ""
+
+        bridge.emit("complete")
+        await bridge._stop_writer()
+
+    asyncio.run(run())
+
+    assert capsys.readouterr().out.splitlines() == [
+        '__MSG__{"type":"stream_chunk","data":{"content":"a"}}__END__',
+        '__MSG__{"type":"stream_end","data":{}}__END__',
+        '__MSG__{"type":"complete","data":{}}__END__',
+    ]
+
+
+def test_ui_manager_sends_empty_payload_for_stream_markers():
+    from hakken.terminal_bridge import UIManager
+
+    sent = []
+    ui = UIManager(lambda msg_type, data: sent.append((msg_type, data)))
+    ui.start_stream_display()
+    ui.stop_stream_display()
+
+    assert sent == [("stream_start", {}), ("stream_end", {})]
+
+
+def test_writer_stops_buffering_after_a_broken_pipe(monkeypatch):
+    class BrokenStdout:
+        def flush(self):
+            pass
+
+        @property
+        def buffer(self):
+            raise BrokenPipeError()
+
+    monkeypatch.setattr("sys.stdout", BrokenStdout())
+
+    async def run():
+        bridge = Bridge()
+        bridge._start_writer()
+        bridge.emit("ready")
+        await asyncio.sleep(0.05)
+
+        assert bridge._writer_task.done()
+        bridge.emit("stream_chunk", {"content": "lost"})
+        bridge.emit("complete")
+        assert not bridge._out
+        await bridge._stop_writer()
+        bridge.flush()
+
+    asyncio.run(run())
+
+
+def test_emit_drops_stream_chunks_beyond_the_buffer_limit(monkeypatch):
+    from hakken import terminal_bridge
+
+    monkeypatch.setattr(terminal_bridge, "EMIT_BUFFER_LIMIT", 10)
+
+    async def run():
+        bridge = Bridge()
+        bridge._start_writer()
+        bridge.emit("stream_chunk", {"content": "kept"})
+        size = len(bridge._out)
+        bridge.emit("stream_chunk", {"content": "dropped"})
+        assert len(bridge._out) == size
+        bridge.emit("stream_end")
+        assert len(bridge._out) > size
+        bridge._out.clear()
+        await bridge._stop_writer()
+
+    asyncio.run(run())
@@ -0,0 +1,47 @@
+import pytest  # type: ignore
+from hakken.tools.execution import terminal
+from hakken.tools.execution.terminal import CmdRunner
+
+
+@pytest.mark.asyncio
+async def test_cmd_runner_returns_stdout_and_stderr():
+    tool = CmdRunner()
+
+    assert await tool.act("echo hello") == "hello\n"
+    assert await tool.act("echo oops >&2; exit 3") == "Command failed with exit code 3:\noops\n"
+
+
+@pytest.mark.asyncio
+async def test_cmd_runner_times_out():
+    result = await CmdRunner().act("sleep 5", timeout=0.1)
+
+    assert result.startswith("Command timed out after 0.1 seconds")
+
+
+@pytest.mark.asyncio
+async def test_cmd_runner_kills_command_when_cancelled(tmp_path):
+    import asyncio
+
+    marker = tmp_path / "finished"
+    task = asyncio.create_task(CmdRunner().act(f"sleep 0.3; touch {marker}"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(0.4)
+    assert not marker.exists()
+
+
+@pytest.mark.asyncio
+async def test_cmd_runner_caps_output(monkeypatch):
+    monkeypatch.setattr(terminal, "MAX_OUTPUT_BYTES", 4)
+
+    result = await CmdRunner().act("printf abcdefgh")
+
+    assert result == "abcd\n[output truncated at 4 bytes]"
+
+
+def test_cmd_runner_schema_is_shared():
+    assert CmdRunner().json_schema() is CmdRunner().json_schema()
+    assert CmdRunner().json_schema()["function"]["name"] == CmdRunner.get_tool_name()
@@ -103,3 +103,20 @@ async def test_todo_tool_removes_md_on_empty(tmp_path):
     # Clear all tasks
     await tool.act(todos=[])
     assert not md_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_todo_tool_status_reuses_parsed_file_until_it_changes(tmp_path):
+    todo_path = tmp_path / ".todos.json"
+    tool = TodoTool(todo_file=str(todo_path), todo_md_file=str(tmp_path / "todo.md"))
+    assert tool.get_status() == "ready (no active todos)"
+
+    await tool.act(todos=[{"id": "1", "content": "Task", "status": "pending"}])
+    assert tool.get_status() == "ready (1 pending, 0 in progress, 0 completed)"
+
+    tool._load_todos = lambda: pytest.fail("status should come from cache")
+    assert tool.get_status() == "ready (1 pending, 0 in progress, 0 completed)"
+
+    del tool._load_todos
+    await tool.act(todos=[{"id": "1", "content": "Task", "status": "completed"}])
+    assert tool.get_status() == "ready (0 pending, 0 in progress, 1 completed)"
@@ -0,0 +1,16 @@
+from hakken.utils import tokens
+
+
+class FakeEncoder:
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+
+def test_count_tokens_falls_back_to_char_heuristic(monkeypatch):
+    monkeypatch.setattr(tokens, "get_encoder", lambda: None)
+    assert tokens.count_tokens("a" * 40) == 10
+
+
+def test_count_tokens_uses_encoder_when_available(monkeypatch):
+    monkeypatch.setattr(tokens, "get_encoder", lambda: FakeEncoder())
+    assert tokens.count_tokens("one two three") == 3
@@ -0,0 +1,27 @@
+from hakken.core.tool_executor import ToolExecutor
+
+
+def make_executor(max_error_length=80):
+    return ToolExecutor(tool_manager=None, ui_manager=None, add_message_callback=None, max_error_length=max_error_length)
+
+
+def test_compact_error_keeps_short_errors():
+    executor = make_executor()
+    assert executor._compact_error("boom\n\n") == "boom\n\n"
+
+
+def test_compact_error_stops_once_under_limit():
+    executor = make_executor(max_error_length=66)
+    error = 'File "/tmp/app.py", line 12, in main\n    run()\nValueError: bad input'
+
+    assert executor._compact_error(error) == 'File "/tmp/app.py:12", in main\n    run()\nValueError: bad input'
+
+
+def test_compact_error_elides_middle_lines():
+    executor = make_executor(max_error_length=40)
+    error = "\n".join(f"line {i} " + "x" * 20 for i in range(10))
+
+    compacted = executor._compact_error(error)
+
+    assert compacted.splitlines()[2] == "[...5 lines omitted...]"
+    assert compacted.startswith("line 0") and compacted.endswith("line 9 " + "x" * 20)
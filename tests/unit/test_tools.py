@@ -28,4 +28,52 @@ def test_tool_manager_list_tools(tool_manager):
 def test_tool_manager_tool_description(tool_manager):
     tool_manager.add_tool("test_tool", "Test Tool Description")
     description = tool_manager.get_tool_description("test_tool")
-    assert description == "Test Tool Description"
\ No newline at end of file
+    assert description == "Test Tool Description"
+
+
+def test_tool_manager_skips_tools_with_missing_dependencies(tool_manager):
+    assert tool_manager.get_tool("todo_write") is None
+    assert tool_manager.get_tool("task") is None
+    assert tool_manager.get_tool("scratchpad") is not None
+
+
+def test_tool_manager_injects_dependencies():
+    ui = object()
+    tool_manager = manager.ToolManager(ui_manager=ui)
+    assert tool_manager.get_tool("todo_write").ui_manager is ui
+    assert tool_manager.get_tool("scratchpad").ui_manager is ui
+
+
+def test_tool_manager_caches_tools_description(tool_manager):
+    first = tool_manager.get_tools_description()
+    assert tool_manager.get_tools_description() is first
+
+
+def test_tool_manager_register_invalidates_description(tool_manager):
+    from hakken.tools.filesystem.read import ReadFileTool
+
+    class ExtraTool(ReadFileTool):
+        @staticmethod
+        def get_tool_name():
+            return "extra_tool"
+
+    first = tool_manager.get_tools_description()
+    tool_manager.register_tool(ExtraTool())
+    second = tool_manager.get_tools_description()
+    assert second is not first
+    assert len(second) == len(first) + 1
+
+
+def test_tool_manager_version_tracks_registry_changes(tool_manager):
+    from hakken.tools.filesystem.read import ReadFileTool
+
+    start = tool_manager.version
+    tool_manager.register_tool(ReadFileTool())
+    assert tool_manager.version == start + 1
+
+    tool_manager.unregister_tool("read_file")
+    assert tool_manager.version == start + 2
+    assert tool_manager.get_tool("read_file") is None
+
+    tool_manager.unregister_tool("read_file")
+    assert tool_manager.version == start + 2
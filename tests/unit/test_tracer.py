@@ -0,0 +1,136 @@
+import json
+from hakken.history.tracer import TraceLogger
+
+
+def read_events(path):
+    return [json.loads(line)["event"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_trace_logger_reuses_file_and_flushes_on_session_end(tmp_path):
+    logger = TraceLogger(base_dir=str(tmp_path), enabled=True)
+    session = logger.start_session({"session_id": "s1"})
+    logger.log_message(session, {"role": "user", "content": "héllo"})
+
+    logger.flush()
+    assert list(logger._files) == [session.path]
+
+    logger.log_event(session, "session_end")
+    assert read_events(session.path) == ["session_start", "message", "session_end"]
+    logger.close()
+
+
+def test_trace_logger_close_writes_pending_events(tmp_path):
+    logger = TraceLogger(base_dir=str(tmp_path), enabled=True)
+    session = logger.start_session({"session_id": "s2"})
+    logger.log_event(session, "token_usage", {"total_tokens": 3})
+
+    logger.close()
+
+    assert read_events(session.path) == ["session_start", "token_usage"]
+    assert logger._files == {}
+
+
+def test_trace_logger_drops_events_when_queue_is_full(tmp_path):
+    class TinyQueueLogger(TraceLogger):
+        QUEUE_SIZE = 1
+
+        def _start_worker(self):
+            pass
+
+    logger = TinyQueueLogger(base_dir=str(tmp_path), enabled=True)
+    logger.start_session({"session_id": "s3"})
+    logger.start_session({"session_id": "s4"})
+
+    assert logger.dropped == 1
+    TraceLogger._start_worker(logger)
+    logger.close()
+
+
+def test_make_json_safe_converts_nested_objects_without_recursion():
+    from types import SimpleNamespace
+
+    logger = TraceLogger(enabled=False)
+    deep = []
+    node = deep
+    for _ in range(5000):
+        child = []
+        node.append(child)
+        node = child
+
+    value = {1: (SimpleNamespace(name="x", tags={"a"}), None), "deep": deep}
+    safe = logger._make_json_safe(value)
+
+    assert safe["1"] == [{"name": "x", "tags": ["a"]}, None]
+    depth, node = 0, safe["deep"]
+    while node:
+        depth, node = depth + 1, node[0]
+    assert depth == 5000
+
+
+def test_format_timestamp_matches_isoformat():
+    from datetime import datetime, timezone
+
+    logger = TraceLogger(enabled=False)
+    timestamp_ns = 1_700_000_000_123_456_789
+
+    expected = datetime.fromtimestamp(1_700_000_000, timezone.utc).replace(microsecond=123456).isoformat()
+    assert logger._format_timestamp(timestamp_ns) == expected
+    assert logger._format_timestamp(timestamp_ns + 1_000) == expected.replace("123456", "123457")
+
+
+def test_log_message_truncates_long_content(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACE_MAX_CONTENT", "8")
+    logger = TraceLogger(base_dir=str(tmp_path), enabled=True)
+    session = logger.start_session({"session_id": "s3"})
+    message = {"role": "tool", "content": "x" * 20}
+
+    logger.log_message(session, message)
+    logger.close()
+
+    lines = session.path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[1])["message"]["content"] == "xxxxxxxx...<truncated 12 chars>"
+    assert message["content"] == "x" * 20
+
+
+def test_log_message_truncates_tool_result_blocks(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from hakken.core.tool_executor import ToolExecutor
+
+    monkeypatch.setenv("TRACE_MAX_CONTENT", "8")
+    messages = []
+    executor = ToolExecutor(tool_manager=None, ui_manager=None, add_message_callback=messages.append)
+    tool_call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="read_file"))
+    executor._add_tool_response(tool_call, "y" * 100_000, reminder="keep")
+    logger = TraceLogger(base_dir=str(tmp_path), enabled=True)
+    session = logger.start_session({"session_id": "s4"})
+
+    logger.log_message(session, messages[0])
+    logger.close()
+
+    lines = session.path.read_text(encoding="utf-8").splitlines()
+    content = json.loads(lines[1])["message"]["content"]
+    assert [block["text"] for block in content] == ["yyyyyyyy...<truncated 99992 chars>", "keep"]
+    assert len(lines[1]) < 1000
+    assert messages[0]["content"][0]["text"] == "y" * 100_000
+
+
+def test_worker_writes_queued_events_in_one_batch_per_file(tmp_path):
+    class DeferredLogger(TraceLogger):
+        def _start_worker(self):
+            pass
+
+    logger = DeferredLogger(base_dir=str(tmp_path), enabled=True)
+    first = logger.start_session({"session_id": "a"})
+    second = logger.start_session({"session_id": "b"})
+    logger.log_event(first, "token_usage")
+    logger.log_event(second, "token_usage")
+
+    writes = []
+    write_now = logger._write_now
+    logger._write_now = lambda path, data: (writes.append(path), write_now(path, data))
+    TraceLogger._start_worker(logger)
+    logger.close()
+
+    assert writes == [first.path, second.path]
+    assert read_events(first.path) == ["session_start", "token_usage"]
+    assert read_events(second.path) == ["session_start", "token_usage"]